@@ -0,0 +1,4 @@
+from aoc2022.runner import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+from aoc2022.gen import scaled_size, write_input
+from aoc2022.registry import Solver, available_days, load_solver
+from aoc2022.util import clean_lines, iter_by_newline, split_by_newline, time_limit
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+import argparse
+import gc
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# the structured parsing each day does inside its solvers, measured on its own,
+# every case is given the lines of the input
+PARSE_CASES: Dict[int, Callable[[ModuleType, list[str]], Any]] = {
+    2: lambda m, lines: [m.decode(line) for line in lines],
+    3: lambda m, lines: [m.line_to_sections(line) for line in lines],
+    4: lambda m, lines: m.lines_to_ranges(lines),
+    5: lambda m, lines: m.Instruction.parse_all(split_by_newline(lines)[1]),
+    7: lambda m, lines: [m.parse_command(line) for line in lines],
+    10: lambda m, lines: [m.parse_instruction(line) for line in lines],
+    11: lambda m, lines: [m.Monkey.parse(group) for group in iter_by_newline(lines)],
+    12: lambda m, lines: m.Grid.from_lines(lines).map(m.Cell.from_char),
+    13: lambda m, lines: [m.parse_data(line) for line in lines if line],
+    14: lambda m, lines: [m.parse_line(line) for line in lines],
+    15: lambda m, lines: m.parse_readings(lines),
+    16: lambda m, lines: [m.ValveInfo.parse(id, line) for id, line in enumerate(lines)],
+}
+
+
+@dataclass
+class Measurement:
+    day: int
+    input: str
+    phase: str
+    status: str
+    runs: int
+    min: float = 0.0
+    median: float = 0.0
+    p95: float = 0.0
+    mean: float = 0.0
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def measure(
+    day: int,
+    path: str,
+    phase: str,
+    prepare: Callable[[], Any],
+    action: Callable[[Any], Any],
+    warmup: int,
+    repeat: int,
+    timeout: Optional[float],
+) -> Measurement:
+    """
+    Times action(prepare()) with warm-up runs, only the action is on the clock
+
+    Whatever the action prints is swallowed.
+    """
+    samples: list[float] = []
+    try:
+        for i in range(warmup + repeat):
+            arg = prepare()
+            gc.collect()
+            with redirect_stdout(io.StringIO()), time_limit(timeout):
+                start = time.perf_counter()
+                action(arg)
+                elapsed = time.perf_counter() - start
+            if i >= warmup:
+                samples.append(elapsed)
+    except TimeoutError:
+        return Measurement(day, path, phase, "timeout", len(samples))
+    except Exception as e:
+        print(f"[BENCH] day {day} {phase} on {path} failed: {e!r}")
+        return Measurement(day, path, phase, "error", len(samples))
+
+    return Measurement(
+        day,
+        path,
+        phase,
+        "ok",
+        len(samples),
+        min(samples),
+        statistics.median(samples),
+        percentile(samples, 0.95),
+        statistics.fmean(samples),
+    )
+
+
+def read_input(solver: Solver, path: str) -> Any:
+    with open(path, mode="r") as f:
+        return solver.parse(f)
+
+
+def read_lines(path: str) -> list[str]:
+    with open(path, mode="r") as f:
+        return clean_lines(f)
+
+
+def bench_day(
+    solver: Solver,
+    path: str,
+    warmup: int,
+    repeat: int,
+    timeout: Optional[float],
+) -> list[Measurement]:
+    def read(path: str = path) -> Any:
+        return read_input(solver, path)
+
+    def lines(path: str = path) -> list[str]:
+        return read_lines(path)
+
+    results: list[Measurement] = []
+    # days that stream or map the file in their solvers only hand the path on,
+    # their reading is timed as part of p1 and p2
+    if not isinstance(read(), str):
+        results.append(
+            measure(
+                solver.day, path, "read", lambda: path, read, warmup, repeat, timeout
+            )
+        )
+
+    parse_case = PARSE_CASES.get(solver.day)
+    if parse_case is not None:
+        case = parse_case
+
+        def parse(lines: list[str]) -> Any:
+            return case(solver.module, lines)
+
+        results.append(
+            measure(solver.day, path, "parse", lines, parse, warmup, repeat, timeout)
+        )
+
+    for part, solve in solver.parts.items():
+        results.append(
+            measure(solver.day, path, part, read, solve, warmup, repeat, timeout)
+        )
+
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_measurement(m: Measurement):
+    if m.status != "ok":
+        print(f"day {m.day:>2}  {m.phase:<6} {m.status:<8} {m.input}")
+        return
+    print(
+        f"day {m.day:>2}  {m.phase:<6} "
+        f"min {m.min * 1000:10.3f}ms  median {m.median * 1000:10.3f}ms  "
+        f"p95 {m.p95 * 1000:10.3f}ms  {m.input}"
+    )
+
+
+def compare(results: list[Measurement], baseline_path: str):
+    with open(baseline_path, mode="r") as f:
+        baseline = json.load(f)
+
+    previous = {
+        (m["day"], m["input"], m["phase"]): m
+        for m in baseline["results"]
+        if m["status"] == "ok"
+    }
+    print()
+    print(f"[BENCH] speedup over {baseline['revision']} ({baseline_path})")
+    for m in results:
+        old = previous.get((m.day, m.input, m.phase))
+        if not old or m.status != "ok" or not m.median:
+            continue
+        ratio = old["median"] / m.median
+        print(f"day {m.day:>2}  {m.phase:<6} {ratio:8.2f}x  {m.input}")
+
+
+def parse_extra_inputs(specs: list[str]) -> Dict[int, list[str]]:
+    extra: Dict[int, list[str]] = {}
+    for spec in specs:
+        day, path = spec.split("=", 1)
+        extra.setdefault(int(day), []).append(path)
+    return extra
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2022.bench",
+        description="Times the read, parse and solve phases of each day",
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to run, default all")
+    parser.add_argument(
+        "--input",
+        action="append",
+        default=[],
+        metavar="DAY=PATH",
+        help="benchmark this file too, e.g. 8=output/gen/day8.txt",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        action="append",
+        default=[],
+        help="also time a generated input this many times the puzzle size",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for --scale inputs")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, help="seconds allowed per run")
+    parser.add_argument("--json", help="where to write results, default output/bench")
+    parser.add_argument("--compare", help="results of another revision to diff with")
+    args = parser.parse_args()
+
+    extra = parse_extra_inputs(args.input)
+    days = args.days or available_days()
+    revision = git_revision()
+
+    results: list[Measurement] = []
+    for day in days:
+        solver = load_solver(day)
+        input = solver.activate()
+        paths = [input.challenge_path] + extra.get(day, [])
+        for scale in args.scale:
+            paths.append(write_input(day, scaled_size(day, scale), args.seed))
+        for path in paths:
+            for m in bench_day(solver, path, args.warmup, args.repeat, args.timeout):
+                print_measurement(m)
+                results.append(m)
+
+    path = args.json or f"./output/bench/{revision}.json"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, mode="w") as f:
+        json.dump(
+            {
+                "revision": revision,
+                "python": platform.python_version(),
+                "argv": sys.argv[1:],
+                "timestamp": time.time(),
+                "results": [asdict(m) for m in results],
+            },
+            f,
+            indent=2,
+        )
+    print(f"[BENCH] Saved {len(results)} measurements to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from aoc2022.gif import is_drawing
+from aoc2022.grid import ArrayGrid
+from aoc2022.instrument import is_instrumenting, logged_channels
+from aoc2022.profiling import is_profiling
+from aoc2022.util import Input
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, TextIO
+
+import io
+import json
+import os
+import sys
+
+CACHE_DIR = "./output/cache"
+MAX_BYTES = 8 * 1024 * 1024
+GRID_CACHE_DIR = "./output/gridcache"
+GRID_MAX_BYTES = 1024 * 1024 * 1024
+
+_digests: dict[tuple[str, int, int], str] = {}
+
+
+@dataclass
+class Entry:
+    day: str
+    part: str
+    input: str
+    output: str
+
+
+def is_caching() -> bool:
+    # painting is a side effect the cache cannot replay, neither are the log
+    # lines of --log channels, profiling and instrumenting need a real run
+    return (
+        "--no-cache" not in sys.argv
+        and not is_drawing()
+        and not is_profiling()
+        and not is_instrumenting()
+        and not logged_channels()
+    )
+
+
+def hex_digest(data: Any) -> str:
+    """
+    SHA-256 of a buffer in hex, hashlib is only loaded once something is cached
+    """
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a file, remembered for as long as the file is not modified
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _digests:
+        with Input.open_mmap(path) as data:
+            _digests[key] = hex_digest(data)
+    return _digests[key]
+
+
+def solver_digest(solver: Callable) -> str:
+    """
+    Hash of the source file that defines the solver, and of the whole aoc2022
+    package, so a fix to a shared module like grid.py is not replayed around
+    """
+    module = sys.modules[solver.__module__]
+    digests = [file_digest(module.__file__ or ""), package_digest()]
+    return hex_digest("|".join(digests).encode())
+
+
+def package_digest() -> str:
+    """
+    Hash of every module of the aoc2022 package
+    """
+    package = os.path.dirname(os.path.abspath(__file__))
+    names = sorted(name for name in os.listdir(package) if name.endswith(".py"))
+    digests = [file_digest(os.path.join(package, name)) for name in names]
+    return hex_digest("|".join(digests).encode())
+
+
+def entry_path(day: str, part: str, input_path: str, solver: Callable) -> str:
+    key = "|".join([day, part, file_digest(input_path), solver_digest(solver)])
+    return f"{CACHE_DIR}/{hex_digest(key.encode())}.json"
+
+
+class Tee(io.StringIO):
+    """
+    Records everything written while still passing it on
+    """
+
+    def __init__(self, out: TextIO):
+        super().__init__()
+        self.out = out
+
+    def write(self, s: str) -> int:
+        self.out.write(s)
+        return super().write(s)
+
+
+def cached_part(day: str, input_path: str, solver: Callable, run: Callable[[], None]):
+    """
+    Replays what the solver printed the last time it ran on the same input,
+    or runs it and remembers the output
+
+    :param str day: e.g. "day11"
+    :param Callable solver: the solve_p1/solve_p2 function, its name and source are part of the key
+    :param Callable run: calls the solver
+    """
+    if not is_caching():
+        run()
+        return
+
+    part = solver.__name__
+    path = entry_path(day, part, input_path, solver)
+    if os.path.exists(path):
+        with open(path, mode="r") as f:
+            entry = Entry(**json.load(f))
+        os.utime(path)  # eviction drops the least recently used entries
+        print(f"[CACHE] {day} {part} unchanged, replaying")
+        sys.stdout.write(entry.output)
+        return
+
+    tee = Tee(sys.stdout)
+    sys.stdout = tee
+    try:
+        run()
+    finally:
+        sys.stdout = tee.out
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # an interrupted write must not leave a truncated entry behind
+    partial = f"{path}.{os.getpid()}"
+    with open(partial, mode="w") as f:
+        json.dump(asdict(Entry(day, part, input_path, tee.getvalue())), f)
+    os.replace(partial, path)
+    evict(MAX_BYTES)
+
+
+def cached_grid(
+    input_path: str, name: str, build: Callable[[], ArrayGrid]
+) -> ArrayGrid:
+    """
+    Maps in the grid that was built from the same input the last time,
+    or builds it and saves it as a binary grid file
+
+    Unlike answers, grids are cached while painting and profiling too,
+    only --no-cache turns it off.
+
+    :param str name: what the grid holds, e.g. "heights"
+    :param Callable build: parses the input, its source is part of the key
+    """
+    if "--no-cache" in sys.argv:
+        return build()
+
+    key = "|".join([name, file_digest(input_path), solver_digest(build)])
+    path = f"{GRID_CACHE_DIR}/{hex_digest(key.encode())}.grid"
+    if os.path.exists(path):
+        os.utime(path)
+        return ArrayGrid.load(path)
+
+    grid = build()
+    os.makedirs(GRID_CACHE_DIR, exist_ok=True)
+    # days run in parallel, a grid file only appears once it is complete
+    partial = f"{path}.{os.getpid()}"
+    grid.save(partial)
+    os.replace(partial, path)
+    evict(GRID_MAX_BYTES, GRID_CACHE_DIR)
+    return grid
+
+
+def evict(max_bytes: int, directory: str = CACHE_DIR):
+    """
+    Deletes the least recently used entries until the cache fits in max_bytes
+
+    Days run in parallel, so the partial files of writes still in progress are
+    left alone, and entries another process evicted first are skipped.
+    """
+    entries = []
+    for name in os.listdir(directory):
+        if not name.endswith((".json", ".grid")):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
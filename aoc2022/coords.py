@@ -1,59 +1,74 @@
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, NamedTuple
 
+_new = tuple.__new__
+
+
+class Coords(NamedTuple):
+    """
+    An (x, y) pair
+
+    A tuple underneath, so hashing and comparing happen in C and nothing is
+    allocated besides the tuple itself. It also compares equal to a plain (x, y)
+    and can index a Grid directly.
+    """
 
-@dataclass(eq=True, frozen=True)
-class Coords:
     x: int
     y: int
 
-    def __add__(self, other: "Coords") -> "Coords":
-        return Coords(self.x + other.x, self.y + other.y)
+    def __add__(self, other: "Coords") -> "Coords":  # type: ignore[override]
+        return _new(Coords, (self[0] + other[0], self[1] + other[1]))
 
     def __sub__(self, other: "Coords") -> "Coords":
-        return Coords(self.x - other.x, self.y - other.y)
+        return _new(Coords, (self[0] - other[0], self[1] - other[1]))
 
     def __repr__(self) -> str:
-        return f"({self.x}, {self.y})"
+        return f"({self[0]}, {self[1]})"
 
     def abs(self) -> "Coords":
-        return Coords(abs(self.x), abs(self.y))
+        return _new(Coords, (abs(self[0]), abs(self[1])))
 
     def manhattan_distance(self, other: "Coords") -> int:
-        diff = (other - self).abs()
-        return diff.x + diff.y
+        return abs(other[0] - self[0]) + abs(other[1] - self[1])
 
     def rect_normalize(self) -> "Coords":
-        abs = self.abs()
-        return Coords(self.x // (abs.x or 1), self.y // (abs.y or 1))
+        x, y = self
+        return _UNITS[(x > 0) - (x < 0)][(y > 0) - (y < 0)]
 
     def rect_distance(self, other: "Coords") -> int:
-        diff = (other - self).abs()
-        return max(diff.x, diff.y)
+        return max(abs(other[0] - self[0]), abs(other[1] - self[1]))
 
     @classmethod
     def parse(cls, text: str) -> "Coords":
         xs, ys = text.split(",")
-        return Coords(int(xs), int(ys))
+        return _new(Coords, (int(xs), int(ys)))
+
+
+ORIGIN = Coords(0, 0)
+LEFT = Coords(-1, 0)
+RIGHT = Coords(1, 0)
+UP = Coords(0, -1)
+DOWN = Coords(0, 1)
 
+# rect_normalize results, indexed by the signs of x and y (-1 wraps to the end)
+_UNITS = [[Coords(x, y) for y in (0, 1, -1)] for x in (0, 1, -1)]
 
 COMMAND_CARD: Dict[str, Coords] = {
-    "L": Coords(-1, 0),
-    "R": Coords(1, 0),
-    "U": Coords(0, -1),
-    "D": Coords(0, 1),
+    "L": LEFT,
+    "R": RIGHT,
+    "U": UP,
+    "D": DOWN,
 }
 
 UN_COMMAND_CARD: Dict[Coords, str] = {
-    Coords(-1, 0): "L",
-    Coords(1, 0): "R",
-    Coords(0, -1): "U",
-    Coords(0, 1): "D",
+    LEFT: "L",
+    RIGHT: "R",
+    UP: "U",
+    DOWN: "D",
 }
 
 ARROW: Dict[Coords, str] = {
-    Coords(-1, 0): "←",
-    Coords(1, 0): "→",
-    Coords(0, -1): "↑",
-    Coords(0, 1): "↓",
+    LEFT: "←",
+    RIGHT: "→",
+    UP: "↑",
+    DOWN: "↓",
 }
@@ -1,6 +1,15 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.util import Input, split_by_newline
+from aoc2022.util import Input, iter_by_newline
 from io import TextIOWrapper
+from itertools import chain, repeat
+from typing import Iterable, Iterator, Tuple
+
+import heapq
+import mmap
+import re
+import sys
+
+BLANK_LINE = re.compile(rb"\r?\n\r?\n")  # the end of a line and an empty one
 
 
 def main():
@@ -8,24 +17,100 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, parse, solve_p1, solve_p2)
+
+
+def parse(f: TextIOWrapper) -> str:
+    return f.name  # the solvers stream the file
+
 
+def split_jobs() -> int:
+    """
+    How many processes add up the elves, set with --split=N, one adds them up inline
+    """
+    for arg in sys.argv:
+        if arg.startswith("--split="):
+            return max(1, int(arg.split("=", 1)[1]))
+    return 1
 
-def solve(f: TextIOWrapper):
-    lines = f.readlines()
-    groups = split_by_newline(lines)
-    calories = [0]  # if this list is empty, max fails
+
+def top_totals(groups: Iterable[list[str]], k: int) -> list[int]:
+    """
+    The k largest group totals, largest first
+
+    Groups are added up as they arrive, only a heap of the k largest totals so
+    far is kept, its smallest on top. It starts out as zeros, so with fewer
+    than k elves the missing ones count as carrying nothing.
+    """
+    if k <= 0:
+        return []
+    heap = [0] * k
     for group in groups:
-        items = list(map(int, group))
-        calories.append(sum(items))
+        total = sum(map(int, group))
+        if total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def split_at_blank_lines(path: str, pieces: int) -> list[Tuple[int, int]]:
+    """
+    Byte ranges of about equal size covering the file, each starting at a group
+    """
+    with Input.open_mmap(path) as data:
+        size = len(data)
+        starts = [0]
+        for i in range(1, pieces):
+            blank = BLANK_LINE.search(data, max(starts[-1], size * i // pieces))
+            if blank is None:
+                break
+            starts.append(blank.end())
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def lines_between(data: mmap.mmap, start: int, end: int) -> Iterator[str]:
+    data.seek(start)
+    while data.tell() < end:
+        yield data.readline().decode()
+
+
+def top_totals_between(path: str, start: int, end: int, k: int) -> list[int]:
+    """
+    top_totals of the groups in a byte range of the file, the work of one process
+    """
+    if start == end:
+        return [0] * k  # also covers empty files, which are not mapped
+    with Input.open_mmap(path) as data:
+        lines = lines_between(data, start, end)  # type: ignore[arg-type]
+        return top_totals(iter_by_newline(lines), k)
+
+
+def elf_calories(path: str, k: int) -> list[int]:
+    """
+    The k largest amounts of calories an elf carries, largest first
+
+    With --split=N the file is cut at blank lines into N pieces, each piece's
+    top k is found in its own process and the top k of those is the answer.
+    """
+    jobs = split_jobs()
+    if jobs == 1:
+        return top_totals(Input.iter_groups(path), k)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    starts, ends = zip(*split_at_blank_lines(path, jobs))
+    with ProcessPoolExecutor(max_workers=len(starts)) as pool:
+        tops = pool.map(top_totals_between, repeat(path), starts, ends, repeat(k))
+        return heapq.nlargest(k, chain.from_iterable(tops))
+
+
+def solve_p1(path: str):
+    top_one = elf_calories(path, 1)[0]
+    print("p1", top_one)
 
-    calories.sort(reverse=True)
-    # top_one = calories[0]
-    # print (top_one)
 
-    top_three = calories[0:3]
-    print(sum(top_three))
+def solve_p2(path: str):
+    top_three = elf_calories(path, 3)
+    print("p2", sum(top_three))
 
 
 if __name__ == "__main__":
@@ -4,7 +4,6 @@ from aoc2022.grid import Grid
 from aoc2022.util import Input, Output, clean_lines
 from dataclasses import dataclass
 from functools import reduce
-from io import TextIOWrapper
 from operator import add
 from typing import Tuple
 
@@ -20,8 +19,7 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
 
 
 @dataclass
@@ -48,12 +46,6 @@ def parse_instruction(line: str) -> Instruction:
             raise Exception(f"cannot parse [{arr}] as an instruction")
 
 
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
-
-
 def state(cycle: int, rx: int) -> str:
     return f"cycle {cycle}, rx {rx}"
 
@@ -65,12 +57,11 @@ def increment_cycle(cycle: int, rx: int, samples: list[Tuple[int, int]]) -> int:
     return cycle
 
 
-def color_map(_x: int, _y: int, char: str) -> Tuple[int, int, int]:
-    return Colors.HIGHLIGHT if char == "#" else Colors.BACKGROUND
+COLORS = {"#": Colors.HIGHLIGHT, ".": Colors.BACKGROUND}
 
 
 def draw_display(display: Grid[str], display_frame: int):
-    drw = display.img_draw(color_map, SCALE)
+    drw = display.img_draw_values(COLORS, SCALE)
     if drw:
         drw.text((1, HEIGHT * SCALE + 1), str(display_frame), fill=Colors.GREEN)
 
@@ -113,7 +104,7 @@ def solve_p2(lines: list[str]):
     cycle = 1
     display = Grid[str](WIDTH, HEIGHT, ".")
     samples: list[Tuple[int, int]] = []
-    initialize_gif(WIDTH * SCALE, HEIGHT * SCALE + HMARGIN)
+    initialize_gif(WIDTH * SCALE, HEIGHT * SCALE + HMARGIN, palette=Colors.all())
 
     for instruction in instructions:
         wait = instruction.cycles
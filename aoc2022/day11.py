@@ -1,8 +1,9 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.util import Input, Output, clean_lines, split_by_newline
+from aoc2022.instrument import channel, counter, timer
+from aoc2022.parse import ints
+from aoc2022.util import Input, Output, clean_lines, iter_by_newline
 from dataclasses import dataclass
 from functools import reduce
-from io import TextIOWrapper
 from operator import mul
 
 import sys
@@ -20,14 +21,7 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
-
-
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
 
 
 @dataclass
@@ -116,115 +110,125 @@ class Monkey:
 
     @classmethod
     def parse(cls, line: list[str]) -> "Monkey":
-        id = int(line[0].replace("Monkey ", "").replace(":", "").strip())
-        items = [
-            int(itm.strip())
-            for itm in line[1].replace("Starting items:", "").split(",")
-        ]
-        op = parse_expr(line[2].replace("Operation: ", "".strip()))
-        test_num = int(line[3].replace("Test: divisible by", "").strip())
-        tmonkey = int(line[4].replace("If true: throw to monkey", "").strip())
-        fmonkey = int(line[5].replace("If false: throw to monkey", "").strip())
+        (id,) = ints(line[0])
+        items = ints(line[1])
+        op = parse_expr(line[2].replace("Operation: ", ""))
+        test_num, tmonkey, fmonkey = ints("\n".join(line[3:6]))
         return Monkey(id, items, op, test_num, tmonkey, fmonkey, 0)
 
 
-def dbg(indent: int, text: str):
-    print(" " * indent + text) if DEBUG else None
-
-
-def inf(indent: int, text: str):
-    print(" " * indent + text) if INFO else None
-
-
-def smr(indent: int, text: str):
-    print(" " * indent + text) if SUMMARY else None
+dbg = channel("day11.debug", DEBUG)
+inf = channel("day11.info", INFO)
+smr = channel("day11.summary", SUMMARY)
+inspections = counter("day11.inspections")
 
 
 def solve_p1(lines: list[str]):
-    monkeys = list(map(Monkey.parse, split_by_newline(lines)))
-
-    for round in range(1, 21):
-        inf(0, f"-------- ROUND {round} --------")
-        for monkey in monkeys:
-            dbg(0, f"Monkey {monkey.id}")
-            for item in monkey.items:
-                dbg(2, f"Monkey inspects an item with a worry level of {item}.")
-                new_worry = monkey.op.eval(item)
-                dbg(4, f"Worry level is updated to {new_worry}.")
-                after_exam = new_worry // 3
-                dbg(
-                    4,
-                    f"Monkey gets bored with item. Worry level is divided by 3 to {after_exam}.",
-                )
-                is_divisible = after_exam % monkey.test_num == 0
-                dbg(
-                    4,
-                    f"Current worry level is {'' if is_divisible else 'not '}divisible by {monkey.test_num}.",
-                )
-                target_id = monkey.true_monkey if is_divisible else monkey.false_monkey
-                dbg(
-                    4,
-                    f"Item with worry level {after_exam} is thrown to monkey {target_id}.",
-                )
-                monkeys[target_id].items.append(after_exam)
-                monkey.total_inspected += 1
-            monkey.items = []
-        inf(
-            0,
-            f"After round {round}, the monkeys are holding items with these worry levels:",
-        )
-        for monkey in monkeys:
-            inf(0, f"Monkey {monkey.id}: {', '.join(map(str, monkey.items))}")
-
-    busiest_monkeys = [
-        monkey.id
-        for monkey in sorted(monkeys, key=lambda m: m.total_inspected, reverse=True)[
-            0:2
-        ]
-    ]
-    for monkey in monkeys:
-        smr(
-            0,
-            f"Monkey {monkey.id} inspected items {monkey.total_inspected} times. {'*' if monkey.id in busiest_monkeys else ''}",
-        )
-    monkey_business = reduce(mul, [monkeys[i].total_inspected for i in busiest_monkeys])
-    smr(0, f"monkey business: {monkey_business}")
-
+    monkeys = list(map(Monkey.parse, iter_by_newline(lines)))
+    debug, info = dbg.enabled, inf.enabled
+
+    with timer("day11.p1.rounds"):
+        for round in range(1, 21):
+            inf(0, "-------- ROUND {} --------", round)
+            for monkey in monkeys:
+                if debug:
+                    dbg(0, "Monkey {}", monkey.id)
+                for item in monkey.items:
+                    new_worry = monkey.op.eval(item)
+                    after_exam = new_worry // 3
+                    is_divisible = after_exam % monkey.test_num == 0
+                    target_id = (
+                        monkey.true_monkey if is_divisible else monkey.false_monkey
+                    )
+                    if debug:
+                        dbg(
+                            2, "Monkey inspects an item with a worry level of {}.", item
+                        )
+                        dbg(4, "Worry level is updated to {}.", new_worry)
+                        dbg(
+                            4,
+                            "Monkey gets bored with item. Worry level is divided by 3 to {}.",
+                            after_exam,
+                        )
+                        dbg(
+                            4,
+                            "Current worry level is {}divisible by {}.",
+                            "" if is_divisible else "not ",
+                            monkey.test_num,
+                        )
+                        dbg(
+                            4,
+                            "Item with worry level {} is thrown to monkey {}.",
+                            after_exam,
+                            target_id,
+                        )
+                    monkeys[target_id].items.append(after_exam)
+                    monkey.total_inspected += 1
+                inspections.add(len(monkey.items))
+                monkey.items = []
+            if info:
+                print_round(round, monkeys)
+
+    monkey_business = summarize(monkeys)
     print("p1", monkey_business)
 
 
 def solve_p2(lines: list[str]):
-    monkeys = list(map(Monkey.parse, split_by_newline(lines)))
+    monkeys = list(map(Monkey.parse, iter_by_newline(lines)))
     super_mod: int = reduce(mul, [monkey.test_num for monkey in monkeys])
+    debug, info = dbg.enabled, inf.enabled
+
+    with timer("day11.p2.rounds"):
+        for round in range(1, 10001):
+            inf(0, "-------- ROUND {} --------", round)
+            for monkey in monkeys:
+                if debug:
+                    dbg(0, "Monkey {}", monkey.id)
+                for item in monkey.items:
+                    new_worry = monkey.op.eval(item)
+                    is_divisible = new_worry % monkey.test_num == 0
+                    target_id = (
+                        monkey.true_monkey if is_divisible else monkey.false_monkey
+                    )
+                    if debug:
+                        dbg(
+                            2, "Monkey inspects an item with a worry level of {}.", item
+                        )
+                        dbg(4, "Worry level is updated to {}.", new_worry)
+                        dbg(
+                            4,
+                            "Current worry level is {}divisible by {}.",
+                            "" if is_divisible else "not ",
+                            monkey.test_num,
+                        )
+                        dbg(
+                            4,
+                            "Item with worry level {} is thrown to monkey {}.",
+                            new_worry,
+                            target_id,
+                        )
+                    monkeys[target_id].items.append(new_worry % super_mod)
+                    monkey.total_inspected += 1
+                inspections.add(len(monkey.items))
+                monkey.items = []
+            if info:
+                print_round(round, monkeys)
+
+    monkey_business = summarize(monkeys)
+    print("p2", monkey_business)
 
-    for round in range(1, 10001):
-        inf(0, f"-------- ROUND {round} --------")
-        for monkey in monkeys:
-            dbg(0, f"Monkey {monkey.id}")
-            for item in monkey.items:
-                dbg(2, f"Monkey inspects an item with a worry level of {item}.")
-                new_worry = monkey.op.eval(item)
-                dbg(4, f"Worry level is updated to {new_worry}.")
-                is_divisible = new_worry % monkey.test_num == 0
-                dbg(
-                    4,
-                    f"Current worry level is {'' if is_divisible else 'not '}divisible by {monkey.test_num}.",
-                )
-                target_id = monkey.true_monkey if is_divisible else monkey.false_monkey
-                dbg(
-                    4,
-                    f"Item with worry level {new_worry} is thrown to monkey {target_id}.",
-                )
-                monkeys[target_id].items.append(new_worry % super_mod)
-                monkey.total_inspected += 1
-            monkey.items = []
-        inf(
-            0,
-            f"After round {round}, the monkeys are holding items with these worry levels:",
-        )
-        for monkey in monkeys:
-            inf(0, f"Monkey {monkey.id}: {', '.join(map(str, monkey.items))}")
 
+def print_round(round: int, monkeys: list[Monkey]):
+    inf(
+        0,
+        "After round {}, the monkeys are holding items with these worry levels:",
+        round,
+    )
+    for monkey in monkeys:
+        inf(0, "Monkey {}: {}", monkey.id, ", ".join(map(str, monkey.items)))
+
+
+def summarize(monkeys: list[Monkey]) -> int:
     busiest_monkeys = [
         monkey.id
         for monkey in sorted(monkeys, key=lambda m: m.total_inspected, reverse=True)[
@@ -234,12 +238,14 @@ def solve_p2(lines: list[str]):
     for monkey in monkeys:
         smr(
             0,
-            f"Monkey {monkey.id} inspected items {monkey.total_inspected} times. {'*' if monkey.id in busiest_monkeys else ''}",
+            "Monkey {} inspected items {} times. {}",
+            monkey.id,
+            monkey.total_inspected,
+            "*" if monkey.id in busiest_monkeys else "",
         )
     monkey_business = reduce(mul, [monkeys[i].total_inspected for i in busiest_monkeys])
-    smr(0, f"monkey business: {monkey_business}")
-
-    print("p2", monkey_business)
+    smr(0, "monkey business: {}", monkey_business)
+    return monkey_business
 
 
 if __name__ == "__main__":
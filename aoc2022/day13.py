@@ -1,5 +1,5 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.util import Input, Output, clean_lines, split_by_newline
+from aoc2022.util import Input, Output
 from dataclasses import dataclass
 from functools import cmp_to_key, reduce
 from io import TextIOWrapper
@@ -15,14 +15,11 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, parse, solve_p1, solve_p2)
 
 
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
+def parse(f: TextIOWrapper) -> str:
+    return f.name  # the solvers stream the file
 
 
 @dataclass
@@ -80,10 +77,9 @@ def compare(lhs: Data, rhs: Data) -> int:
     return 0
 
 
-def solve_p1(lines: list[str]):
-    pairs = split_by_newline(lines)
+def solve_p1(path: str):
     indices = []
-    for i, pair in enumerate(pairs):
+    for i, pair in enumerate(Input.iter_groups(path)):
         lhs = parse_data(pair[0])
         rhs = parse_data(pair[1])
         if compare(lhs, rhs) > 0:
@@ -92,8 +88,8 @@ def solve_p1(lines: list[str]):
     print("p1", indices, sum(indices))
 
 
-def solve_p2(lines: list[str]):
-    packets = [parse_data(line) for line in lines if line]
+def solve_p2(path: str):
+    packets = [parse_data(line) for line in Input.iter_lines(path) if line]
     dividers = [parse_data(divider) for divider in ["[[2]]", "[[6]]"]]
     packets.extend(dividers)
     packets.sort(key=cmp_to_key(compare), reverse=True)
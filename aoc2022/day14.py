@@ -1,9 +1,10 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.coords import Coords
-from aoc2022.gif import initialize_gif, request_frame, save_gif
+from aoc2022.coords import Coords, DOWN, LEFT, RIGHT
+from aoc2022.gif import FrameInfo, Logarithmic, initialize_gif, save_gif, submit_frame
 from aoc2022.grid import Grid, Viewport
+from aoc2022.instrument import channel, counter, timer
 from aoc2022.util import Input, Output, clean_lines
-from PIL import ImageDraw
+from typing import Tuple
 
 
 def main():
@@ -11,15 +12,18 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            lines = clean_lines(f)
-            solve_p1(lines)
-            solve_p2(lines)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
 
 
 Path = list[Coords]
+Snapshot = Tuple[list[str], list[Tuple[int, int]]]  # viewport rows, highlighted cells
 ORIGIN = Coords(500, 0)
+DLEFT = DOWN + LEFT
+DRIGHT = DOWN + RIGHT
+VIEW_ORIGIN = Coords(400, 0)
 SCALE = 1
+# every flake is painted falling at first, then every 10th, 100th and 1000th
+FLAKE_SCHEDULE = Logarithmic(10, max_stride=1000)
 COLORS = {
     "+": (127, 127, 255),
     ".": (0, 0, 50),
@@ -29,8 +33,13 @@ COLORS = {
 }
 
 
+progress = channel("day14.progress", enabled=True)
+flakes = counter("day14.flakes")
+steps = counter("day14.steps")
+
+
 def view(grid: Grid[str]) -> Viewport[str]:
-    return Viewport(grid, Coords(400, 0), 200, 200)
+    return Viewport(grid, VIEW_ORIGIN, 200, 200)
 
 
 def draw_grid(grid: Grid[str], highlight: list[Coords] = [], snowflake_id=0):
@@ -38,27 +47,29 @@ def draw_grid(grid: Grid[str], highlight: list[Coords] = [], snowflake_id=0):
     if highlight and highlight[0].y > viewport.height:
         return
 
-    if snowflake_id > 10 and snowflake_id % 10 != 0:
-        return
+    def snapshot() -> Snapshot:
+        rows = ["".join(row) for row in viewport.rows()]
+        marks = [(c.x - viewport.origin.x, c.y - viewport.origin.y) for c in highlight]
+        return rows, marks
 
-    if snowflake_id > 100 and snowflake_id % 100 != 0:
-        return
+    submit_frame(render_grid, snapshot, step=snowflake_id)
 
-    if snowflake_id > 1000 and snowflake_id % 1000 != 0:
-        return
 
-    frame = request_frame()
-    if not frame:
-        return
+def render_grid(frame: FrameInfo, state: Snapshot):
+    from PIL import ImageDraw
 
+    rows, highlight = state
+    width, height = len(rows[0]), len(rows)
     draw = ImageDraw.Draw(frame.image)
-    draw.rectangle((0, 0, viewport.width, viewport.height), fill=COLORS["."])
-    for x, y, sym in viewport.enumerate_all_cells():
-        if Coords(x, y) + viewport.origin in highlight:
-            sym = "H"
-        if sym != ".":
-            draw.point((x * SCALE, y * SCALE), fill=COLORS[sym])
+    draw.rectangle((0, 0, width, height), fill=COLORS["."])
+    for y, row in enumerate(rows):
+        for x, sym in enumerate(row):
+            if sym != ".":
+                draw.point((x * SCALE, y * SCALE), fill=COLORS[sym])
         # draw.rectangle((x * SCALE, y * SCALE, (x + 1) * SCALE, (y + 1) * SCALE), fill=COLORS[sym])
+    for x, y in highlight:
+        if 0 <= x < width and 0 <= y < height:
+            draw.point((x * SCALE, y * SCALE), fill=COLORS["H"])
 
 
 def parse_line(line: str) -> Path:
@@ -80,9 +91,6 @@ def build_paths(grid: Grid[str], paths: list[Path]):
 
 def simulate_snowflake(grid: Grid[str], snowflake_id: int) -> bool:
     snowflake = ORIGIN
-    DOWN = Coords(0, 1)
-    DLEFT = Coords(-1, 1)
-    DRIGHT = Coords(1, 1)
 
     while snowflake.y < 499:
         draw_grid(grid, [snowflake], snowflake_id)
@@ -99,6 +107,7 @@ def simulate_snowflake(grid: Grid[str], snowflake_id: int) -> bool:
             snowflake = test
             continue
         grid.set_by(snowflake, "o")
+        steps.add(snowflake.y)  # every step falls one row
         return True
 
     return False
@@ -108,7 +117,12 @@ def solve_p1(lines: list[str]):
     paths = [parse_line(line) for line in lines]
     grid = Grid(1000, 500, ".")
     viewport = view(grid)
-    initialize_gif(viewport.width * SCALE, viewport.height * SCALE)
+    initialize_gif(
+        viewport.width * SCALE,
+        viewport.height * SCALE,
+        palette=COLORS.values(),
+        schedule=FLAKE_SCHEDULE,
+    )
 
     print("building walls...")
     build_paths(grid, paths)
@@ -116,11 +130,13 @@ def solve_p1(lines: list[str]):
     print("simulating snowflakes")
     cont = True
     snowflake_count = 0
-    while cont:
-        cont = simulate_snowflake(grid, snowflake_count)
-        snowflake_count += 1
-        if snowflake_count % 10 == 0:
-            print(f"simulated {snowflake_count} flakes...")
+    with timer("day14.p1.simulate"):
+        while cont:
+            cont = simulate_snowflake(grid, snowflake_count)
+            snowflake_count += 1
+            if snowflake_count % 10 == 0:
+                progress(0, "simulated {} flakes...", snowflake_count)
+    flakes.add(snowflake_count)
 
     print("drawing result...")
     draw_grid(grid)
@@ -134,16 +150,19 @@ def build_floor(grid: Grid[str]):
         if "#" in grid.row(y):
             max_y = y
     max_y += 2
-    yrow = grid.row(max_y)
-    for x in range(grid.width):
-        yrow[x] = "#"
+    grid.view(Coords(0, max_y), grid.width, 1).fill("#")
 
 
 def solve_p2(lines: list[str]):
     paths = [parse_line(line) for line in lines]
     grid = Grid(1000, 500, ".")
     viewport = view(grid)
-    initialize_gif(viewport.width * SCALE, viewport.height * SCALE)
+    initialize_gif(
+        viewport.width * SCALE,
+        viewport.height * SCALE,
+        palette=COLORS.values(),
+        schedule=FLAKE_SCHEDULE,
+    )
 
     print("building walls...")
     build_paths(grid, paths)
@@ -151,11 +170,13 @@ def solve_p2(lines: list[str]):
 
     print("simulating snowflakes")
     snowflake_count = 0
-    while grid.get_by(ORIGIN) != "o":
-        simulate_snowflake(grid, snowflake_count)
-        snowflake_count += 1
-        if snowflake_count % 10 == 0:
-            print(f"simulated {snowflake_count} flakes...")
+    with timer("day14.p2.simulate"):
+        while grid.get_by(ORIGIN) != "o":
+            simulate_snowflake(grid, snowflake_count)
+            snowflake_count += 1
+            if snowflake_count % 10 == 0:
+                progress(0, "simulated {} flakes...", snowflake_count)
+    flakes.add(snowflake_count)
 
     print("drawing result...")
     draw_grid(grid)
@@ -1,5 +1,6 @@
 from aoc2022.advent import set_day_from_filename
 from aoc2022.coords import Coords
+from aoc2022.parse import ints_array
 from aoc2022.util import Input, Output, clean_lines
 from dataclasses import dataclass
 from typing import Tuple
@@ -10,10 +11,7 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            lines = clean_lines(f)
-            solve_p1(lines)
-            solve_p2(lines)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
 
 
 @dataclass
@@ -89,18 +87,16 @@ class Reading:
         return Reading(sensor, beacon, sensor.manhattan_distance(beacon))
 
 
-def parse_line(line: str) -> Reading:
-    template = (
-        line.replace("Sensor at x=", "")
-        .replace(" y=", "")
-        .replace(": closest beacon is at x=", ",")
-    )
-    parts = list(map(int, template.split(",")))
-    return Reading.create(Coords(parts[0], parts[1]), Coords(parts[2], parts[3]))
+def parse_readings(lines: list[str]) -> list[Reading]:
+    # every line is sensor x, y then beacon x, y, the words around them do not matter
+    numbers = ints_array("\n".join(lines)).reshape(-1, 4).tolist()
+    return [
+        Reading.create(Coords(sx, sy), Coords(bx, by)) for sx, sy, bx, by in numbers
+    ]
 
 
 def solve_p1(lines: list[str]):
-    readings = [parse_line(line) for line in lines]
+    readings = parse_readings(lines)
     target_y = 10 if len(lines) < 15 else 2_000_000
 
     hor_spans = [reading.hor_span(target_y) for reading in readings]
@@ -109,7 +105,7 @@ def solve_p1(lines: list[str]):
 
 
 def solve_p2(lines: list[str]):
-    readings = [parse_line(line) for line in lines]
+    readings = parse_readings(lines)
     target_y = 20 if len(lines) < 15 else 4_000_000
 
     # for y in range(target_y):
@@ -124,7 +120,6 @@ def solve_p2(lines: list[str]):
     hor_spans = [reading.hor_span(y) for reading in readings]
     x = list(Span.find_gap(hor_spans))[0]
 
-
     print("p2", x * 4_000_000 + y)
 
 
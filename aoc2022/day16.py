@@ -1,22 +1,28 @@
 from aoc2022.advent import set_day_from_filename
 from aoc2022.gif import is_drawing
+from aoc2022.instrument import channel, counter
+from aoc2022.parse import Fields, tokens
 from aoc2022.util import Input, Output, clean_lines
 from dataclasses import dataclass, field
 from functools import cache
 from typing import Any, Callable, Optional
 
-import igraph as ig
-
 
 def main():
     set_day_from_filename(__file__)
     input = Input.for_advent()
     for file in [input.test_path]: #, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            lines = clean_lines(f)
-            solve_p1(lines)
-            solve_p2(lines)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
+
+
+# "tunnel leads to valve" for one tunnel, the lowercase words never match a name
+VALVE = Fields(
+    "Valve {name} has flow rate={flow_rate}; {tunnels}",
+    name=r"[A-Z]+",
+    tunnels=r".*",
+)
+VALVE_NAME = r"[A-Z]+"
 
 
 @dataclass
@@ -28,14 +34,9 @@ class ValveInfo:
 
     @classmethod
     def parse(cls, id: int, text: str) -> "ValveInfo":
-        text = text.replace("Valve ", "")
-        text = text.replace(" has flow rate=", ",")
-        text = text.replace("; tunnels lead to valve", ",")
-        text = text.replace("; tunnel leads to valve", ",")
-        text = text.replace("s ", "")
-        text = text.replace(", ", ",")
-        parts = text.split(",")
-        return ValveInfo(id, parts[0], int(parts[1]), parts[2:])
+        name, flow_rate, leads_to = VALVE.parse(text)
+        tunnels = tokens(leads_to, VALVE_NAME)
+        return ValveInfo(id, name, flow_rate, tunnels)
 
 
 @dataclass
@@ -160,6 +161,8 @@ def draw_cave(cave: Cave):
     if not is_drawing():
         return
 
+    import igraph as ig
+
     valves = cave.valves
     edges = [
         (valve.id, cave[neighbor].id) for valve in valves for neighbor in valve.tunnels
@@ -235,6 +238,9 @@ timeline = 0
 max_relief = 0
 best_history: Any = None
 
+progress = channel("day16.progress", enabled=True)
+timelines = counter("day16.timelines")
+
 def tree_of_all_possible_moves(cave: Cave) -> ActionTree:
     global timeline, max_relief, best_history
     timeline = 0
@@ -248,13 +254,16 @@ def tree_of_all_possible_moves(cave: Cave) -> ActionTree:
 
         if node.timeleft == 0:
             timeline += 1
+            timelines.add()
             relieved = node.relieved(cave)
             if relieved > max_relief:
                 max_relief = relieved
                 best_history = node.history()
             if timeline % 1000 == 0:
-                print(f"{timeline} timelines calculated, max relief: {max_relief}")
-                print(best_history)
+                progress(
+                    0, "{} timelines calculated, max relief: {}", timeline, max_relief
+                )
+                progress(0, "{}", best_history)
             return children
 
         if node.location not in node.opened:
@@ -1,5 +1,5 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.util import Input, split_by_newline
+from aoc2022.util import Input
 from io import TextIOWrapper
 from typing import Dict, Final, Tuple
 
@@ -9,8 +9,7 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, parse, solve_p2)
 
 
 LOSS: Final[int] = 0
@@ -68,29 +67,25 @@ def decode(line: str) -> Tuple[str, ...]:
     return tuple(map(str.rstrip, line.split(" ")))
 
 
-def solve(f: TextIOWrapper):
-    lines = f.readlines()
-    # solve_p1(lines)
-    solve_p2(lines)
+def parse(f: TextIOWrapper) -> str:
+    return f.name  # the solvers stream the file
 
 
-def solve_p1(lines: list[str]):
-    scores: list[int] = []
-    for line in lines:
+def solve_p1(path: str):
+    total = 0
+    for line in Input.iter_lines(path):
         enemy, you = decode(line)
-        score = calc_score(enemy, you)
-        scores.append(score)
-    print(sum(scores))
+        total += calc_score(enemy, you)
+    print(total)
 
 
-def solve_p2(lines: list[str]):
-    scores: list[int] = []
-    for line in lines:
+def solve_p2(path: str):
+    total = 0
+    for line in Input.iter_lines(path):
         enemy, your_strat = decode(line)
         you = strat_to_shape[enemy][your_strat]
-        score = calc_score(enemy, you)
-        scores.append(score)
-    print(sum(scores))
+        total += calc_score(enemy, you)
+    print(total)
 
 
 if __name__ == "__main__":
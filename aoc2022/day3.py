@@ -1,7 +1,7 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.util import Input, split_to_chunks
+from aoc2022.util import Input, iter_chunks
 from io import TextIOWrapper
-from typing import Tuple
+from typing import Sequence, Tuple
 
 
 def main():
@@ -9,14 +9,11 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, parse, solve_p1, solve_p2)
 
 
-def solve(f: TextIOWrapper):
-    lines = list(map(str.rstrip, f.readlines()))
-    solve_p1(lines)
-    solve_p2(lines)
+def parse(f: TextIOWrapper) -> str:
+    return f.name  # the solvers stream the file
 
 
 def line_to_sections(line: str) -> Tuple[str, str]:
@@ -36,22 +33,22 @@ def common_item(lhs: str, rhs: str) -> str:
     return common_item_of_list([lhs, rhs])
 
 
-def common_item_of_list(lst: list[str]) -> str:
+def common_item_of_list(lst: Sequence[str]) -> str:
     sets = [set(s) for s in lst]
     intersection = set.intersection(*sets)
     return list(intersection)[0]
 
 
-def solve_p1(lines: list[str]):
-    results = []
-    for first, second in map(line_to_sections, lines):
+def solve_p1(path: str):
+    result = 0
+    for first, second in map(line_to_sections, Input.iter_lines(path)):
         item = common_item(first, second)
-        results.append(priority(item))
-    print("p1", sum(results))
+        result += priority(item)
+    print("p1", result)
 
 
-def solve_p2(lines: list[str]):
-    groups = split_to_chunks(lines, 3)
+def solve_p2(path: str):
+    groups = iter_chunks(Input.iter_lines(path), 3)
     badges = map(common_item_of_list, groups)
     priorities = map(priority, badges)
     print("p2", sum(priorities))
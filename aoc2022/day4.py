@@ -1,18 +1,19 @@
 from aoc2022.advent import set_day_from_filename
 from aoc2022.gif import is_drawing
+from aoc2022.parse import ints_array
 from aoc2022.util import Input, Output, clean_lines
-from io import TextIOWrapper
 from typing import Tuple
-from PIL import Image
 
 
 def main():
     set_day_from_filename(__file__)
     input = Input.for_advent()
+    parts = [solve_p1, solve_p2]
+    if is_drawing():
+        parts.append(solve_image)
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, clean_lines, *parts)
 
 
 class Range:
@@ -36,11 +37,6 @@ class Range:
     def contains(self, id: int) -> bool:
         return self.l <= id <= self.r
 
-    @classmethod
-    def parse(cls, text: str) -> "Range":
-        ids = list(map(int, text.split("-")))
-        return Range(ids[0], ids[1])
-
     @classmethod
     def contains_symmetrical(cls, lhs: "Range", rhs: "Range") -> bool:
         return lhs.contains_range(rhs) or rhs.contains_range(lhs)
@@ -55,24 +51,15 @@ class Range:
         )
 
 
-def line_to_ranges(line: str) -> Tuple[Range, Range]:
-    chunks = line.split(",")
-    ranges = list(map(Range.parse, chunks))
-    return ranges[0], ranges[1]
-
-
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
-    if is_drawing():
-        solve_image(lines)
+def lines_to_ranges(lines: list[str]) -> list[Tuple[Range, Range]]:
+    # "-" separates the ids here, it is no minus sign
+    ids = ints_array("\n".join(lines), signed=False).reshape(-1, 4).tolist()
+    return [(Range(a, b), Range(c, d)) for a, b, c, d in ids]
 
 
 def solve_p1(lines: list[str]):
     result = 0
-    for line in lines:
-        l, r = line_to_ranges(line)
+    for l, r in lines_to_ranges(lines):
         if Range.contains_symmetrical(l, r):
             result += 1
     print("p1", result)
@@ -80,15 +67,16 @@ def solve_p1(lines: list[str]):
 
 def solve_p2(lines: list[str]):
     result = 0
-    for line in lines:
-        l, r = line_to_ranges(line)
+    for l, r in lines_to_ranges(lines):
         if Range.overlaps(l, r):
             result += 1
     print("p1", result)
 
 
 def solve_image(lines: list[str]):
-    ranges = list(map(line_to_ranges, lines))
+    from PIL import Image
+
+    ranges = lines_to_ranges(lines)
     width = 10 if len(ranges) < 10 else 100
     img = Image.new("RGB", (width, len(lines)), "black")
     pixels = img.load()  # type: ignore
@@ -1,9 +1,9 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.gif import initialize_gif, request_frame, save_gif, GIF_FONT
+from aoc2022.gif import FrameInfo, initialize_gif, save_gif, gif_font, submit_frame
+from aoc2022.parse import ints_array
 from aoc2022.util import Input, Output, split_by_newline
 from io import TextIOWrapper
-from PIL import ImageDraw
-from typing import Any
+from typing import AbstractSet, Any, Sequence
 
 # sizes
 BOX_WIDTH = 10
@@ -17,6 +17,7 @@ BACKGROUND = (0, 0, 100)
 HIGHLIGHT = (255, 0, 100)
 MAIN_FILL = (0, 255, 100)
 GREEN = (0, 255, 100)
+PALETTE = [BACKGROUND, HIGHLIGHT, MAIN_FILL, GREEN]
 
 
 def main():
@@ -24,14 +25,11 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, parse, solve_p1, solve_p2)
 
 
-def solve(f: TextIOWrapper):
-    lines = f.readlines()
-    solve_p1(lines)
-    solve_p2(lines)
+def parse(f: TextIOWrapper) -> list[str]:
+    return f.readlines()  # keep the trailing spaces, they give the stack count
 
 
 def solve_p1(lines: list[str]):
@@ -39,7 +37,7 @@ def solve_p1(lines: list[str]):
     data, commands = split_by_newline(lines)
     load_stacks(data, stacks)
     initialize_images(stacks)
-    instructions = map(Instruction.parse, commands)
+    instructions = Instruction.parse_all(commands)
     draw_stacks(stacks)
     for i in instructions:
         i.execute(stacks)
@@ -57,7 +55,7 @@ def solve_p2(lines: list[str]):
     stacks = initialize_stacks(lines[0])
     data, commands = split_by_newline(lines)
     load_stacks(data, stacks)
-    instructions = map(Instruction.parse, commands)
+    instructions = Instruction.parse_all(commands)
     for i in instructions:
         i.execute_9001(stacks)
 
@@ -91,23 +89,28 @@ def initialize_images(stacks: list[list[Any]]):
     rows = max(map(len, stacks)) * 5  # 5 times max size for safety (not enough tho)
     image_width = BORDER + columns * (BOX_WIDTH + BORDER)
     image_height = (rows + 2) * (BOX_HEIGHT + BORDER)
-    initialize_gif(image_width, image_height)
+    initialize_gif(image_width, image_height, palette=PALETTE)
 
 
 def draw_stacks(stacks: list[list[str]], highlights=None):
-    frame_info = request_frame()
+    submit_frame(
+        render_stacks,
+        lambda: (tuple(tuple(stack) for stack in stacks), frozenset(highlights or ())),
+    )
+
 
-    if not frame_info:
-        return
+def render_stacks(
+    frame_info: FrameInfo,
+    state: tuple[Sequence[Sequence[str]], AbstractSet[tuple[int, int]]],
+):
+    from PIL import ImageDraw
 
+    stacks, highlights = state
     img = frame_info.image
     img_w, img_h = img.size
     draw = ImageDraw.Draw(img)
     draw.rectangle(((0, 0), (img_w, img_h)), BACKGROUND)
 
-    if highlights == None:
-        highlights = set()
-
     for col, stack in enumerate(stacks):
         for row, letter in enumerate(stack):
             x0 = BORDER + (BOX_WIDTH + BORDER) * col
@@ -121,7 +124,7 @@ def draw_stacks(stacks: list[list[str]], highlights=None):
     draw.text(
         (BORDER, img_h - BORDER - BOX_HEIGHT),
         str(frame_info.frame_number),
-        font=GIF_FONT,
+        font=gif_font(),
         fill=GREEN,
     )
 
@@ -163,9 +166,12 @@ class Instruction:
         draw_stacks(stacks)
 
     @classmethod
-    def parse(cls, line: str) -> "Instruction":
-        items = line.split(" ")
-        return cls(int(items[3]), int(items[5]), int(items[1]))
+    def parse_all(cls, lines: list[str]) -> list["Instruction"]:
+        """
+        Parses every line at once, the numbers of all of them go into one array
+        """
+        numbers = ints_array("\n".join(lines)).reshape(-1, 3).tolist()
+        return [cls(move_from, move_to, count) for count, move_from, move_to in numbers]
 
 
 if __name__ == "__main__":
@@ -1,34 +1,35 @@
 from aoc2022.advent import set_day_from_filename
-from aoc2022.gif import initialize_gif, request_frame, save_gif, GIF_FONT
+from aoc2022.gif import Budget, initialize_gif, request_frame, save_gif, gif_font
 from aoc2022.util import Input, Output
 from io import TextIOWrapper
 from typing import Set, Tuple
 
+import mmap
+
 
 def main():
     set_day_from_filename(__file__)
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
+        input.solve(file, parse, solve_p1, solve_p2)
 
 
-def solve(f: TextIOWrapper):
-    line = f.read()
-    solve_p1(line)
-    solve_p2(line)
+def parse(f: TextIOWrapper) -> str:
+    return f.name  # the solvers map the file
 
 
-def solve_p1(line: str):
-    print("p1", get_message_start(4, line))
+def solve_p1(path: str):
+    with Input.open_mmap(path) as line:
+        print("p1", get_message_start(4, line))
 
 
-def solve_p2(line: str):
-    print("p2", get_message_start(14, line))
+def solve_p2(path: str):
+    with Input.open_mmap(path) as line:
+        print("p2", get_message_start(14, line))
 
 
-def get_message_start(chunk_size: int, line: str) -> int:
+def get_message_start(chunk_size: int, line: bytes | mmap.mmap) -> int:
     initialize_marker_gif(len(line))
     result = -1
     draw_state(line, set())
@@ -40,8 +41,8 @@ def get_message_start(chunk_size: int, line: str) -> int:
             result = i
             break
 
-    draw_state(line, set(range(l + 1, r + 2)))
-    draw_state(line, set(range(l + 1, r + 2)))
+    draw_state(line, set(range(l + 1, r + 2)), always=True)
+    draw_state(line, set(range(l + 1, r + 2)), always=True)
     save_gif(Output.create(name=f"chunk_{chunk_size}"), loop=0, duration=25)
     return result
 
@@ -52,9 +53,10 @@ def chunk_range(i: int, size: int) -> Tuple[int, int]:
 
 # --------- DRAWING ---------
 
-from PIL import ImageDraw
 import math
 
+MAX_FRAMES = 250
+
 # sizes
 BOX_WIDTH = 10
 BOX_HEIGHT = 10
@@ -67,6 +69,7 @@ HIGHLIGHT = (255, 0, 100)
 MAIN_FILL = (0, 255, 100)
 SCAN = (255, 255, 255)
 GREEN = (0, 255, 100)
+PALETTE = [BACKGROUND, HIGHLIGHT, MAIN_FILL, SCAN, GREEN]
 
 
 def table_size(num_chars: int) -> Tuple[int, int]:
@@ -79,21 +82,25 @@ def initialize_marker_gif(num_chars: int):
     cols, rows = table_size(num_chars)
     width = BORDER * 2 + MARGIN * (cols - 1) + BOX_WIDTH * cols
     height = BORDER * 2 + MARGIN * (rows - 1) + BOX_WIDTH * rows
-    initialize_gif(width, height)
+    initialize_gif(
+        width, height, palette=PALETTE, schedule=Budget(MAX_FRAMES, num_chars)
+    )
 
 
-def draw_state(text: str, scan_range: Set[int]):
-    frame_info = request_frame()
+def draw_state(text: bytes | mmap.mmap, scan_range: Set[int], always: bool = False):
+    frame_info = request_frame(always=always)
     if not frame_info:
         return
 
+    from PIL import ImageDraw
+
     print("frame", frame_info.frame_number)
     img = frame_info.image
     img_w, img_h = img.size
     draw = ImageDraw.Draw(img)
     draw.rectangle(((0, 0), (img_w, img_h)), BACKGROUND)
 
-    letters = list(map(lambda i: text[i], scan_range))
+    letters = list(map(lambda i: chr(text[i]), scan_range))
     dupes = set()
     for letter in letters:
         if letters.count(letter) > 1:
@@ -107,18 +114,18 @@ def draw_state(text: str, scan_range: Set[int]):
                 break
             x = BORDER + MARGIN * col + BOX_WIDTH * col
             y = BORDER + MARGIN * row + BOX_HEIGHT * row
-            letter = text[index]
+            letter = chr(text[index])
             if index in scan_range:
                 color = HIGHLIGHT if letter in dupes else SCAN
             else:
                 color = MAIN_FILL
-            draw.text((x, y), letter.upper(), font=GIF_FONT, fill=color)
+            draw.text((x, y), letter.upper(), font=gif_font(), fill=color)
 
     # frame counter
     draw.text(
         (BORDER, img_h - BORDER - BOX_HEIGHT),
         str(frame_info.frame_number),
-        font=GIF_FONT,
+        font=gif_font(),
         fill=GREEN,
     )
 
@@ -1,6 +1,5 @@
 from aoc2022.advent import set_day_from_filename
 from aoc2022.util import Input, clean_lines
-from io import TextIOWrapper
 from dataclasses import dataclass
 from typing import Dict, Optional
 
@@ -10,14 +9,7 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
-
-
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
 
 
 @dataclass
@@ -1,10 +1,10 @@
 from aoc2022.advent import set_day_from_filename
+from aoc2022.cache import cached_grid
 from aoc2022.gif import initialize_gif, save_gif
-from aoc2022.grid import Grid
-from aoc2022.util import Input, Output, clean_lines
-from dataclasses import dataclass
+from aoc2022.grid import ArrayGrid, BitGrid, Grid
+from aoc2022.util import Input, Output
 from io import TextIOWrapper
-from typing import Any, Iterable, Tuple
+from typing import Any, Tuple
 
 
 def main():
@@ -12,64 +12,53 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
-
-
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
+        input.solve(file, parse, solve_p1, solve_p2)
 
 
 SCALE = 8
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
 
 
-@dataclass
-class Cell:
-    value: int
-    visible: bool
-    score: int
+def parse(f: TextIOWrapper) -> ArrayGrid[int]:
+    return cached_grid(f.name, "heights", lambda: read_heights(f.name))
 
-    @classmethod
-    def of_char(cls, char: str):
-        return cls(int(char), False, 0)
 
+def read_heights(path: str) -> ArrayGrid[int]:
+    with Input.open_mmap(path) as data:
+        digits = ArrayGrid.from_bytes(data)
+        heights = digits.map(lambda a: a - ord("0"), vectorized=True)
+    # anything but a digit wraps around to more than 9
+    assert heights.cells.max() <= 9, f"{path} has a cell that is not a digit"
+    return heights
 
-def solve_p1(lines: list[str]):
-    grid = Grid.from_lines(lines).map(Cell.of_char)
-    initialize_gif(*grid.img_get_size(scale=SCALE))
-
-    for y in range(grid.height):
-        row = grid.row(y)
-        process_visibility(row)
-        process_visibility(reversed(row))
 
-    for x in range(grid.width):
-        col = grid.col(x)
-        process_visibility(col)
-        process_visibility(reversed(col))
+def solve_p1(heights: ArrayGrid[int]):
+    visible = visible_trees(heights)
+    initialize_gif(visible.width * SCALE, visible.height * SCALE)
 
-    if grid.height < 10:
-        draw_grid_visibility(grid)
-
-    grid.img_draw(visibility_color_map, scale=SCALE)
+    if heights.height < 10:
+        draw_grid_visibility(heights, visible)
+    heights.img_draw(
+        lambda x, y, value: visibility_color_map(value, visible[x, y]),
+        scale=SCALE,
+    )
 
-    print("p1", len([c for c in grid.all_cells() if c.visible]))
+    print("p1", visible.count())
     save_gif(Output.create(name="visibility"))
 
 
-def solve_p2(lines: list[str]):
-    grid = Grid.from_lines(lines).map(Cell.of_char)
+def solve_p2(heights: ArrayGrid[int]):
+    grid = heights.to_grid()
     initialize_gif(*grid.img_get_size(scale=SCALE))
 
-    for x, y, cell in grid.enumerate_all_cells():
-        u, d = calculate_view(grid.col(x), y)
+    cols = [grid.col(x) for x in range(grid.width)]
+    scores = grid.map(lambda _: 0)
+    for x, y, value in grid.enumerate_all_cells():
+        u, d = calculate_view(cols[x], y)
         l, r = calculate_view(grid.row(y), x)
-        cell.score = u * d * l * r
+        scores[x, y] = u * d * l * r
 
-    grid.img_draw(score_color_map, scale=SCALE)
-    scores = grid.map(lambda c: c.score)
+    grid.img_draw(lambda x, y, value: score_color_map(value, scores[x, y]), scale=SCALE)
 
     if scores.height < 10:
         print(scores)
@@ -77,29 +66,35 @@ def solve_p2(lines: list[str]):
     save_gif(Output.create(name="scores"))
 
 
-def process_visibility(cells: Iterable[Cell]):
-    cur_height = -1
-    for c in cells:
-        if c.value > cur_height:
-            c.visible = True
-            cur_height = c.value
+def visible_trees(heights: ArrayGrid[int]) -> BitGrid:
+    """
+    A tree is visible from a side if no tree at least as tall stands between it
+    and the edge, this is checked for all trees of one height at once
+    """
+    at_least = [BitGrid.from_array(heights.cells >= h) for h in range(10)]
+    at_least.append(BitGrid(heights.width, heights.height))
+
+    visible = BitGrid(heights.width, heights.height)
+    for h in range(10):
+        trees = at_least[h].andnot(at_least[h + 1])
+        for dx, dy in DIRECTIONS:
+            hidden = at_least[h].smear(dx, dy).shift(dx, dy)
+            visible |= trees.andnot(hidden)
+    return visible
 
 
-def calculate_view(cells: list[Cell], pos: int) -> Tuple[int, int]:
-    cell_height = cells[pos].value
+def calculate_view(cells: list[int], pos: int) -> Tuple[int, int]:
+    cell_height = cells[pos]
     l_distance = 0
     for i in range(pos - 1, -1, -1):
-        cell = cells[i]
         l_distance += 1
-        if cell.value >= cell_height:
+        if cells[i] >= cell_height:
             break
 
-    cell_height = cells[pos].value
     r_distance = 0
     for i in range(pos + 1, len(cells)):
-        cell = cells[i]
         r_distance += 1
-        if cell.value >= cell_height:
+        if cells[i] >= cell_height:
             break
     return l_distance, r_distance
 
@@ -110,34 +105,34 @@ class bcolors:
     ENDC = "\033[0m"
 
 
-def draw_grid_visibility(grid: Grid[Cell]):
+def draw_grid_visibility(heights: ArrayGrid[int], visible: BitGrid):
     current_row = 0
     current_text = ""
-    for _, y, cell in grid.enumerate_all_cells():
+    for x, y, value in heights.enumerate_all_cells():
         if y > current_row:
             print(current_text)
             current_text = ""
             current_row = y
-        if cell.visible:
-            current_text += f"{bcolors.LITE}{cell.value}{bcolors.ENDC}"
+        if visible[x, y]:
+            current_text += f"{bcolors.LITE}{value}{bcolors.ENDC}"
         else:
-            current_text += f"{bcolors.DARK}{cell.value}{bcolors.ENDC}"
+            current_text += f"{bcolors.DARK}{value}{bcolors.ENDC}"
     print(current_text)
 
 
-def visibility_color_map(x: int, y: int, z: Cell) -> Any:
-    intensity = z.value * 12  # 0-120
-    # return (intensity + 120, intensity + 120, intensity) if z.visible else (intensity // 4 * 3, (intensity + 120) // 4 * 3, intensity // 4 * 3)
+def visibility_color_map(value: int, visible: bool) -> Any:
+    intensity = value * 12  # 0-120
+    # return (intensity + 120, intensity + 120, intensity) if visible else (intensity // 4 * 3, (intensity + 120) // 4 * 3, intensity // 4 * 3)
     return (
         (intensity, intensity + 120, intensity)
-        if z.visible
+        if visible
         else (intensity // 4 * 3 + 40, intensity // 4 * 3 + 70, intensity // 4 * 3 + 40)
     )
 
 
-def score_color_map(x: int, y: int, z: Cell) -> Any:
-    height_intensity = int((z.value / 10) * 64)
-    score_intensity = int((z.score / 315495) * 192)
+def score_color_map(value: int, score: int) -> Any:
+    height_intensity = int((value / 10) * 64)
+    score_intensity = int((score / 315495) * 192)
     return (
         height_intensity + score_intensity,
         height_intensity + score_intensity,
@@ -1,9 +1,9 @@
 from aoc2022.advent import set_day_from_filename
 from aoc2022.coords import Coords, COMMAND_CARD
 from aoc2022.gif import initialize_gif, request_frame, save_gif, Colors
+from aoc2022.grid import SparseGrid
 from aoc2022.util import Input, Output, clean_lines
 from dataclasses import dataclass
-from io import TextIOWrapper
 from typing import Dict, Tuple
 
 
@@ -12,14 +12,7 @@ def main():
     input = Input.for_advent()
     for file in [input.test_path, input.challenge_path]:
         print("input:", file)
-        with open(file, mode="r") as f:
-            solve(f)
-
-
-def solve(f: TextIOWrapper):
-    lines = clean_lines(f)
-    solve_p1(lines)
-    solve_p2(lines)
+        input.solve(file, clean_lines, solve_p1, solve_p2)
 
 
 def solve_p1(lines: list[str]):
@@ -27,18 +20,18 @@ def solve_p1(lines: list[str]):
         [parts[0] * int(parts[1]) for parts in [line.split(" ") for line in lines]]
     )
     head = tail = Coords(0, 0)
-    tail_history = []
+    visited = SparseGrid(False)
 
     for cmd in commands:
-        tail_history.append(tail)
+        visited.set_by(tail, True)
 
         head += COMMAND_CARD[cmd]
 
         if head.rect_distance(tail) > 1:
             tail += (head - tail).rect_normalize()
 
-    draw_final_positions("p1", tail_history)
-    print("p1", head, tail, len(set(tail_history)))
+    draw_final_positions("p1", visited)
+    print("p1", head, tail, visited.count(True))
 
 
 def solve_p2(lines: list[str]):
@@ -47,10 +40,10 @@ def solve_p2(lines: list[str]):
     )
 
     rope = [Coords(0, 0) for _ in range(10)]
-    tail_history = []
+    visited = SparseGrid(False)
 
     for cmd in commands:
-        tail_history.append(rope[-1])
+        visited.set_by(rope[-1], True)
 
         rope[0] += COMMAND_CARD[cmd]
 
@@ -58,8 +51,8 @@ def solve_p2(lines: list[str]):
             if hd.rect_distance(tl) > 1:
                 rope[1 + i] += (hd - tl).rect_normalize()
 
-    draw_final_positions("p2", tail_history)
-    print("p2", len(set(tail_history)))
+    draw_final_positions("p2", visited)
+    print("p2", visited.count(True))
 
 
 def output_map(points: list[Tuple[str, Coords]], size: Tuple[Coords, Coords]):
@@ -79,36 +72,26 @@ def output_map(points: list[Tuple[str, Coords]], size: Tuple[Coords, Coords]):
     print()
 
 
-def output_final_positions(history: list[Coords]):
-    positions = set(history)
-    for y in range(min([t.y for t in history]), max([t.y for t in history]) + 1):
-        row = ""
-        for x in range(min([t.x for t in history]), max([t.x for t in history]) + 1):
-            row += "#" if Coords(x, y) in positions else "."
-        print(row)
+def output_final_positions(visited: SparseGrid[bool]):
+    for y in range(visited.min_y, visited.max_y + 1):
+        print("".join("#" if v else "." for v in visited.row(y)))
     print()
 
 
-def draw_final_positions(part: str, history: list[Coords]):
-    l, r = min([t.x for t in history]), max([t.x for t in history])
-    u, d = min([t.y for t in history]), max([t.y for t in history])
-    width = r - l + 1
-    height = d - u + 1
-    initialize_gif(width, height)
+def draw_final_positions(part: str, visited: SparseGrid[bool]):
+    (l, u), _ = visited.bounds()
+    initialize_gif(visited.width, visited.height)
 
     frame = request_frame()
     if not frame:
         return
 
-    positions = set(history)
     img = frame.image
     pixels = img.load()  # type: ignore
     for y in range(img.height):
         for x in range(img.width):
             sx, sy = x + l, y + u
-            pixels[x, y] = (
-                Colors.GREEN if Coords(sx, sy) in positions else Colors.BACKGROUND
-            )
+            pixels[x, y] = Colors.GREEN if visited[sx, sy] else Colors.BACKGROUND
             if Coords(sx, sy).rect_distance(Coords(0, 0)) < 2:
                 pixels[x, y] = Colors.HIGHLIGHT
 
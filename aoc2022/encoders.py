@@ -0,0 +1,306 @@
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator, Optional, Tuple
+
+import json
+import shutil
+import tempfile
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+@dataclass
+class DumpedFrame:
+    mode: str
+    length: int
+    palette: Optional[int] = None  # index into FrameDump.palettes
+    repeat: int = 1
+
+
+class FrameDump:
+    """
+    Raw frames back to back in a temporary file, identical consecutive frames once
+
+    This is what frames go to while a day runs: it costs little more than copying
+    the pixels, and any encoder can read the frames back one by one when saving.
+    """
+
+    size: Tuple[int, int]
+    frames: list[DumpedFrame]
+    palettes: list[list[int]]
+    spill: IO[bytes]
+    previous: Optional[bytes]
+
+    def __init__(self, size: Tuple[int, int]):
+        self.size = size
+        self.frames = []
+        self.palettes = []
+        self.spill = tempfile.TemporaryFile()
+        self.previous = None
+
+    def add(self, image: "Image.Image"):
+        data = image.tobytes()
+        palette = None
+        if image.mode == "P":
+            colors = image.getpalette() or []
+            if not self.palettes or self.palettes[-1] != colors:
+                self.palettes.append(colors)
+            palette = len(self.palettes) - 1
+
+        last = self.frames[-1] if self.frames else None
+        if last and (last.mode, last.palette) == (image.mode, palette):
+            if data == self.previous:
+                last.repeat += 1
+                return
+        self.spill.write(data)
+        self.frames.append(DumpedFrame(image.mode, len(data), palette))
+        self.previous = data
+
+    def __iter__(self) -> Iterator[Tuple["Image.Image", int]]:
+        """
+        The distinct frames and how many times each one was added in a row
+        """
+        from PIL import Image
+
+        self.spill.seek(0)
+        for frame in self.frames:
+            image = Image.frombytes(
+                frame.mode, self.size, self.spill.read(frame.length)
+            )
+            if frame.palette is not None:
+                image.putpalette(self.palettes[frame.palette])
+            yield image, frame.repeat
+
+    def close(self):
+        self.spill.close()
+
+
+class DumpImages:
+    """
+    The images of a dump past the first one, for Pillow's append_images
+
+    Pillow may go through them more than once, each pass reads them from disk again.
+    """
+
+    def __init__(self, dump: FrameDump):
+        self.dump = dump
+
+    def __iter__(self) -> Iterator["Image.Image"]:
+        frames = iter(self.dump)
+        next(frames)
+        for image, _ in frames:
+            yield image
+
+
+@dataclass
+class EncodedFrame:
+    length: int
+    transparency: Optional[int] = None
+    repeat: int = 1
+
+
+class GifStream:
+    """
+    Encodes frames one by one instead of holding all of them until the end
+
+    Like Pillow does when saving a whole sequence, each frame is quantized, cropped
+    to what changed since the previous one with the unchanged pixels left transparent,
+    and identical frames are merged into one. The encoded data goes to a temporary file,
+    since the header and the frame delays depend on options only known when the gif
+    is saved. Apart from that, only the previous frame and the first one stay in memory.
+    """
+
+    size: Tuple[int, int]
+    frames: list[EncodedFrame]
+    spill: IO[bytes]
+    first: Optional["Image.Image"]
+    previous: Optional["Image.Image"]
+
+    def __init__(self, size: Tuple[int, int]):
+        self.size = size
+        self.frames = []
+        self.spill = tempfile.TemporaryFile()
+        self.first = None
+        self.previous = None
+
+    def add(self, image: "Image.Image", repeat: int = 1):
+        from PIL import GifImagePlugin, Image
+
+        if image.mode == "P":
+            frame = image
+        else:
+            frame = image.convert("P", palette=Image.Palette.ADAPTIVE)
+        if self.previous is None:
+            # the first frame uses the global color table,
+            # the others bring their own unless they have the same palette
+            self.first = self.previous = frame
+            self.write(EncodedFrame(0, repeat=repeat), GifImagePlugin.getdata(frame))
+            return
+
+        delta = difference(self.previous, frame)
+        bbox = delta.getbbox()
+        if not bbox:
+            self.frames[-1].repeat += repeat
+            return
+        self.previous = frame
+
+        transparency = unused_color(frame)
+        if transparency is not None:
+            frame = frame.copy()
+            frame.paste(transparency, mask=delta.point(lambda d: 0 if d else 255))
+        if bbox != (0, 0) + frame.size:
+            frame = frame.crop(bbox)
+        # the delay and transparency go in front of it when saving
+        assert self.first is not None
+        data = GifImagePlugin.getdata(
+            frame,
+            offset=bbox[:2],
+            include_color_table=frame.getpalette() != self.first.getpalette(),
+        )
+        self.write(EncodedFrame(0, transparency, repeat), data)
+
+    def write(self, frame: EncodedFrame, data: list[bytes]):
+        for chunk in data:
+            frame.length += self.spill.write(chunk)
+        self.frames.append(frame)
+
+    def save(self, path: str, duration: Optional[int] = None, **kwargs):
+        from PIL import GifImagePlugin
+
+        assert self.first is not None
+        info = dict(kwargs, duration=duration)
+        header, _ = GifImagePlugin.getheader(self.first, info=info)
+
+        self.spill.seek(0)
+        with open(path, mode="wb") as f:
+            for chunk in header:
+                f.write(chunk)
+            for frame in self.frames:
+                delay = int((duration or 0) * frame.repeat / 10)
+                if delay or frame.transparency is not None:
+                    f.write(graphic_control(delay, frame.transparency))
+                f.write(self.spill.read(frame.length))
+            f.write(b";")
+        self.spill.close()
+
+
+def difference(previous: "Image.Image", frame: "Image.Image") -> "Image.Image":
+    """
+    Single band image that is zero where two palette images show the same color
+    """
+    from PIL import Image, ImageChops
+
+    if previous.getpalette() == frame.getpalette():
+        previous, frame = [
+            Image.frombytes("L", im.size, im.tobytes()) for im in (previous, frame)
+        ]
+        return ImageChops.difference(frame, previous)
+
+    delta = ImageChops.difference(frame.convert("RGB"), previous.convert("RGB"))
+    r, g, b = delta.split()
+    return ImageChops.lighter(ImageChops.lighter(r, g), b)
+
+
+def unused_color(frame: "Image.Image") -> Optional[int]:
+    """
+    A palette index no pixel of the frame uses, picked the way Pillow picks it
+    """
+    index = len(frame.getpalette() or []) // 3
+    if index < 256:
+        return index
+    for i, count in reversed(list(enumerate(frame.histogram()))):
+        if count == 0:
+            return i
+    return None
+
+
+def graphic_control(delay: int, transparency: Optional[int]) -> bytes:
+    """
+    GIF extension block with the frame delay in hundredths of a second
+    and the transparent palette index
+    """
+    flags = 0 if transparency is None else 1
+    return (
+        b"!\xf9\x04"
+        + bytes([flags])
+        + delay.to_bytes(2, "little")
+        + bytes([transparency or 0, 0])
+    )
+
+
+def encode_gif(dump: FrameDump, path: str, duration: Optional[int] = None, **kwargs):
+    stream = GifStream(dump.size)
+    for image, repeat in dump:
+        stream.add(image, repeat)
+    stream.save(path, duration, **kwargs)
+
+
+def encode_with_pillow(
+    format: str, dump: FrameDump, path: str, duration: Optional[int] = None, **kwargs
+):
+    """
+    Animated PNG or WebP, through Pillow's save_all
+
+    Frames are read back from the dump as Pillow asks for them, but Pillow itself
+    keeps the APNG frames (and the WebP images) until the file is written.
+    """
+    if format == "WEBP":
+        kwargs.setdefault("lossless", True)  # the frames are flat colored pixel art
+    if duration:
+        kwargs["duration"] = [duration * frame.repeat for frame in dump.frames]
+    first, _ = next(iter(dump))
+    first.save(
+        path,
+        format=format,
+        save_all=len(dump.frames) > 1,
+        append_images=DumpImages(dump),
+        **kwargs,
+    )
+
+
+def encode_raw(dump: FrameDump, path: str, duration: Optional[int] = None, **kwargs):
+    """
+    The dump as is, behind a line of json describing the frames
+
+    Lossless and about as fast as writing to disk gets, read it back with read_raw.
+    """
+    header = {
+        "size": dump.size,
+        "duration": duration,
+        "palettes": dump.palettes,
+        "frames": [asdict(frame) for frame in dump.frames],
+        **kwargs,
+    }
+    dump.spill.seek(0)
+    with open(path, mode="wb") as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        shutil.copyfileobj(dump.spill, f)
+
+
+def read_raw(path: str) -> Iterator[Tuple["Image.Image", int]]:
+    """
+    The frames of a file written by encode_raw, with how many times each one repeats
+    """
+    from PIL import Image
+
+    with open(path, mode="rb") as f:
+        header = json.loads(f.readline())
+        width, height = header["size"]
+        for frame in map(lambda f: DumpedFrame(**f), header["frames"]):
+            image = Image.frombytes(frame.mode, (width, height), f.read(frame.length))
+            if frame.palette is not None:
+                image.putpalette(header["palettes"][frame.palette])
+            yield image, frame.repeat
+
+
+Encoder = Callable[..., None]
+
+# by file extension
+ENCODERS: dict[str, Encoder] = {
+    "gif": encode_gif,
+    "png": partial(encode_with_pillow, "PNG"),
+    "apng": partial(encode_with_pillow, "PNG"),
+    "webp": partial(encode_with_pillow, "WEBP"),
+    "frames": encode_raw,
+}
@@ -0,0 +1,78 @@
+from types import ModuleType
+from typing import Iterable, Optional
+
+import aoc2022.gen
+import importlib
+import math
+import os
+import pkgutil
+import random
+import re
+
+DAY_MODULE = re.compile(r"^day(\d+)$")
+
+
+def available_generators() -> list[int]:
+    days = []
+    for info in pkgutil.iter_modules(aoc2022.gen.__path__):
+        match = DAY_MODULE.match(info.name)
+        if match:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def generator_for(day: int) -> ModuleType:
+    """
+    Every aoc2022.gen.dayN module provides
+    `PUZZLE_SIZE` (the size knob of a real puzzle input),
+    optionally `DIMENSIONS` (2 if the size is a side of a square-ish area)
+    and `generate(size, rng)` yielding the input lines.
+    """
+    return importlib.import_module(f"aoc2022.gen.day{day}")
+
+
+def scaled_size(day: int, scale: float) -> int:
+    """
+    Size knob for an input `scale` times bigger than the puzzle one
+    """
+    module = generator_for(day)
+    dimensions = getattr(module, "DIMENSIONS", 1)
+    return max(1, math.ceil(module.PUZZLE_SIZE * scale ** (1 / dimensions)))
+
+
+def default_path(day: int, size: int, seed: int) -> str:
+    return f"./output/gen/day{day}-{size}-{seed}.txt"
+
+
+def write_lines(path: str, lines: Iterable[str]):
+    """
+    Writes the lines the way the puzzle inputs look (no newline after the last one)
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, mode="w") as f:
+        first = True
+        for line in lines:
+            if not first:
+                f.write("\n")
+            f.write(line)
+            first = False
+
+
+def write_input(
+    day: int, size: int, seed: int = 0, path: Optional[str] = None, reuse=True
+) -> str:
+    """
+    Generates an input for a day and returns its path
+
+    :param int size: the day's size knob, see PUZZLE_SIZE of the generator
+    :param int seed: same day, size and seed always give the same file
+    :param bool reuse: keep an already generated file at the default path
+    """
+    if not path:
+        path = default_path(day, size, seed)
+        if reuse and os.path.exists(path):
+            return path
+
+    module = generator_for(day)
+    write_lines(path, module.generate(size, random.Random(seed)))
+    return path
@@ -0,0 +1,33 @@
+from aoc2022.gen import available_generators, scaled_size, write_input
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2022.gen", description="Generates synthetic inputs"
+    )
+    parser.add_argument(
+        "days", nargs="*", type=int, help="days to generate, default all"
+    )
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--size", type=int, help="the day's own size knob")
+    size.add_argument(
+        "--scale", type=float, default=1, help="times the puzzle input size"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="output file (a single day only)")
+    args = parser.parse_args()
+
+    days = args.days or available_generators()
+    if args.output and len(days) > 1:
+        parser.error("--output only works with a single day")
+
+    for day in days:
+        size = args.size or scaled_size(day, args.scale)
+        path = write_input(day, size, args.seed, args.output, reuse=False)
+        print(f"[GEN] day {day} size {size} seed {args.seed}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 250  # elves
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    for elf in range(size):
+        if elf > 0:
+            yield ""
+        for _ in range(rng.randint(1, 15)):
+            yield str(rng.randint(1000, 60000))
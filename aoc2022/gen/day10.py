@@ -0,0 +1,18 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 145  # instructions
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    rx = 1
+    for _ in range(size):
+        if rng.random() < 0.35:
+            yield "noop"
+        else:
+            # keep the sprite somewhere around the display
+            amount = rng.randint(-10, 10) or 1
+            if not -5 <= rx + amount <= 45:
+                amount = -amount
+            rx += amount
+            yield f"addx {amount}"
@@ -0,0 +1,42 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 8  # monkeys
+
+
+def primes(count: int) -> list[int]:
+    result: list[int] = []
+    candidate = 2
+    while len(result) < count:
+        if all(candidate % p != 0 for p in result if p * p <= candidate):
+            result.append(candidate)
+        candidate += 1
+    return result
+
+
+def operation(rng: Random) -> str:
+    match rng.randint(0, 5):
+        case 0:
+            return "old * old"
+        case 1 | 2:
+            return f"old * {rng.randint(2, 19)}"
+        case _:
+            return f"old + {rng.randint(1, 8)}"
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    size = max(size, 2)
+    tests = primes(size)
+    rng.shuffle(tests)
+    for id in range(size):
+        if id > 0:
+            yield ""
+        others = [rng.randrange(size - 1) for _ in range(2)]
+        others = [other + 1 if other >= id else other for other in others]
+        items = [str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8))]
+        yield f"Monkey {id}:"
+        yield f"  Starting items: {', '.join(items)}"
+        yield f"  Operation: new = {operation(rng)}"
+        yield f"  Test: divisible by {tests[id]}"
+        yield f"    If true: throw to monkey {others[0]}"
+        yield f"    If false: throw to monkey {others[1]}"
@@ -0,0 +1,26 @@
+from random import Random
+from typing import Iterator
+
+import string
+
+PUZZLE_SIZE = 80  # width, the height is half of it
+DIMENSIONS = 2
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    """
+    Terrain climbing from left to right, with one row where the climb always works
+    """
+    width = max(size, 26)
+    height = max(size // 2, 3)
+    path_row = rng.randrange(height)
+    for y in range(height):
+        row = []
+        for x in range(width):
+            elevation = x * 26 // width
+            if y != path_row:
+                elevation = max(0, elevation - rng.choice([0, 0, 0, 1, 3]))
+            row.append(string.ascii_lowercase[elevation])
+        if y == path_row:
+            row[0], row[-1] = "S", "E"
+        yield "".join(row)
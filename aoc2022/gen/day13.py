@@ -0,0 +1,24 @@
+from random import Random
+from typing import Any, Iterator
+
+import json
+
+PUZZLE_SIZE = 150  # pairs of packets
+
+
+def packet(rng: Random, depth: int = 0) -> list[Any]:
+    result: list[Any] = []
+    for _ in range(rng.randint(0, 5)):
+        if depth < 4 and rng.random() < 0.3:
+            result.append(packet(rng, depth + 1))
+        else:
+            result.append(rng.randint(0, 10))
+    return result
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    for pair in range(size):
+        if pair > 0:
+            yield ""
+        yield json.dumps(packet(rng), separators=(",", ":"))
+        yield json.dumps(packet(rng), separators=(",", ":"))
@@ -0,0 +1,30 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 170  # rock paths
+
+# day14 works on a 1000x500 grid, with the floor 2 below the lowest rock
+# and the part 2 sand pile as wide as it is deep around x=500
+MAX_X = 999
+MAX_Y = 480
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    """
+    Rock paths around x=500, the cave gets wider and deeper with the size
+    until it fills day14's grid
+    """
+    spread = min(10 + size // 2, 480)
+    depth = min(20 + size // 2, MAX_Y)
+    for _ in range(size):
+        x, y = rng.randint(500 - spread, 500 + spread), rng.randint(5, depth)
+        points = [f"{x},{y}"]
+        for i in range(rng.randint(1, 5)):
+            if i % 2 == 0:
+                x += rng.choice([-1, 1]) * rng.randint(1, 8)
+                x = min(max(0, x), MAX_X)
+            else:
+                y += rng.choice([-1, 1]) * rng.randint(1, 8)
+                y = min(max(2, y), MAX_Y)
+            points.append(f"{x},{y}")
+        yield " -> ".join(points)
@@ -0,0 +1,20 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 30  # sensors
+
+EXTENT = 4_000_000
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    beacons = [
+        (
+            rng.randint(-EXTENT // 4, EXTENT * 5 // 4),
+            rng.randint(-EXTENT // 4, EXTENT * 5 // 4),
+        )
+        for _ in range(max(1, size // 3))
+    ]
+    for _ in range(size):
+        sx, sy = rng.randint(0, EXTENT), rng.randint(0, EXTENT)
+        bx, by = min(beacons, key=lambda b: abs(b[0] - sx) + abs(b[1] - sy))
+        yield f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}"
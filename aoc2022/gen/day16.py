@@ -0,0 +1,49 @@
+from random import Random
+from typing import Iterator
+
+import itertools
+import string
+
+PUZZLE_SIZE = 60  # valves
+
+
+def valve_names(count: int) -> list[str]:
+    names: list[str] = []
+    length = 2
+    while len(names) < count:
+        for letters in itertools.product(string.ascii_uppercase, repeat=length):
+            name = "".join(letters)
+            if name != "AA":
+                names.append(name)
+            if len(names) == count:
+                break
+        length += 1
+    return names
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    """
+    A connected cave with a quarter of the valves working, AA is always there
+    """
+    size = max(size, 2)
+    names = ["AA"] + valve_names(size - 1)
+    rng.shuffle(names)
+
+    tunnels: list[set[int]] = [set() for _ in range(size)]
+    for valve in range(1, size):
+        other = rng.randrange(valve)
+        tunnels[valve].add(other)
+        tunnels[other].add(valve)
+    for _ in range(size // 4):
+        a, b = rng.sample(range(size), 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+
+    for valve in range(size):
+        flow = rng.randint(1, 25) if names[valve] != "AA" and rng.random() < 0.25 else 0
+        targets = [names[t] for t in sorted(tunnels[valve])]
+        if len(targets) == 1:
+            lead = f"tunnel leads to valve {targets[0]}"
+        else:
+            lead = f"tunnels lead to valves {', '.join(targets)}"
+        yield f"Valve {names[valve]} has flow rate={flow}; {lead}"
@@ -0,0 +1,9 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 2500  # rounds
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    for _ in range(size):
+        yield f"{rng.choice('ABC')} {rng.choice('XYZ')}"
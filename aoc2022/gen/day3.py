@@ -0,0 +1,37 @@
+from random import Random
+from typing import Iterator
+
+import string
+
+PUZZLE_SIZE = 100  # groups of three elves
+
+ITEMS = string.ascii_lowercase + string.ascii_uppercase
+
+
+def rucksack(rng: Random, pool: list[str], badge: str) -> str:
+    """
+    Two halves sharing exactly one item, the badge is in the first half
+    """
+    pool = pool[:]
+    rng.shuffle(pool)
+    common = rng.choice(pool + [badge])
+    rest = [item for item in pool if item != common]
+    left, right = rest[: len(rest) // 2], rest[len(rest) // 2 :]
+
+    half = rng.randint(6, 16)
+    first = [common, badge] + [rng.choice(left) for _ in range(half - 2)]
+    second = [common] + [rng.choice(right) for _ in range(half - 1)]
+    rng.shuffle(first)
+    rng.shuffle(second)
+    return "".join(first) + "".join(second)
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    for _ in range(size):
+        badge = rng.choice(ITEMS)
+        others = [item for item in ITEMS if item != badge]
+        rng.shuffle(others)
+        # every elf of the group gets its own items, so only the badge is shared
+        third = len(others) // 3
+        for elf in range(3):
+            yield rucksack(rng, others[elf * third : (elf + 1) * third], badge)
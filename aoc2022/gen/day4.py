@@ -0,0 +1,15 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 1000  # pairs
+
+
+def section_range(rng: Random) -> str:
+    l = rng.randint(1, 99)
+    r = rng.randint(l, 99)
+    return f"{l}-{r}"
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    for _ in range(size):
+        yield f"{section_range(rng)},{section_range(rng)}"
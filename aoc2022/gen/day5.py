@@ -0,0 +1,32 @@
+from random import Random
+from typing import Iterator
+
+import string
+
+PUZZLE_SIZE = 500  # moves
+STACKS = 9  # the stack numbers have to stay single digits
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    max_height = 8 + size // 100
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, max_height))]
+        for _ in range(STACKS)
+    ]
+
+    for row in range(max(map(len, stacks)) - 1, -1, -1):
+        yield " ".join(
+            f"[{stack[row]}]" if row < len(stack) else "   " for stack in stacks
+        )
+    yield " ".join(f" {i + 1} " for i in range(STACKS))
+    yield ""
+
+    # no stack ends up empty, the answer needs a crate on top of each
+    heights = list(map(len, stacks))
+    for _ in range(size):
+        fr = rng.choice([i for i, h in enumerate(heights) if h > 1])
+        to = rng.choice([i for i in range(STACKS) if i != fr])
+        count = rng.randint(1, min(heights[fr] - 1, 10))
+        heights[fr] -= count
+        heights[to] += count
+        yield f"move {count} from {fr + 1} to {to + 1}"
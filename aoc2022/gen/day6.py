@@ -0,0 +1,28 @@
+from random import Random
+from typing import Iterator
+
+import string
+
+PUZZLE_SIZE = 4096  # characters
+
+
+def noise(rng: Random, length: int) -> str:
+    # three letters never make a window of four different ones
+    return "".join(rng.choice("abc") for _ in range(length))
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    """
+    One line where both markers show up as late as possible
+    """
+    size = max(size, 40)
+    letters = list(string.ascii_lowercase[3:])
+    rng.shuffle(letters)
+    packet, message = letters[:4], letters[:14]
+    body = size - len(packet) - len(message)
+    yield (
+        noise(rng, body // 2)
+        + "".join(packet)
+        + noise(rng, body - body // 2)
+        + "".join(message)
+    )
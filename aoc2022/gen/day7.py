@@ -0,0 +1,36 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 200  # directories
+
+EXTENSIONS = ["", ".txt", ".dat", ".log", ".bin"]
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    """
+    A terminal session walking a directory tree depth first
+
+    Each directory hangs off one of the few latest ones, so the tree gets deep.
+    """
+    children: list[list[int]] = [[] for _ in range(size)]
+    for node in range(1, size):
+        children[rng.randint(max(0, node - 3), node - 1)].append(node)
+
+    yield "$ cd /"
+    stack = [iter([0])]
+    while stack:
+        dir = next(stack[-1], None)
+        if dir is None:
+            stack.pop()
+            if len(stack) > 1:
+                yield "$ cd .."
+            continue
+        if dir != 0:
+            yield f"$ cd d{dir}"
+
+        yield "$ ls"
+        for child in children[dir]:
+            yield f"dir d{child}"
+        for file in range(rng.randint(0, 4)):
+            yield f"{rng.randint(1000, 300000)} f{file}{rng.choice(EXTENSIONS)}"
+        stack.append(iter(children[dir]))
@@ -0,0 +1,10 @@
+from random import Random
+from typing import Iterator
+
+PUZZLE_SIZE = 99  # side of the forest
+DIMENSIONS = 2
+
+
+def generate(size: int, rng: Random) -> Iterator[str]:
+    for _ in range(size):
+        yield "".join(rng.choice("0123456789") for _ in range(size))
@@ -1,13 +1,37 @@
 from aoc2022.advent import current_day
 from aoc2022.util import Output
-from dataclasses import dataclass
-from PIL import Image, ImageFont
-from typing import Optional, Tuple
+from collections import deque
+from dataclasses import dataclass, field
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Tuple, Union
 
+import math
 import os
 import sys
+import time
 
-GIF_FONT = ImageFont.truetype("./res/font.ttf")
+# PIL, the font, the encoders and the render pool are loaded on first use,
+# most runs never paint
+if TYPE_CHECKING:
+    from aoc2022.encoders import FrameDump
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from PIL import Image, ImageFont
+
+
+@cache
+def gif_font() -> "ImageFont.FreeTypeFont":
+    from PIL import ImageFont
+
+    return ImageFont.truetype("./res/font.ttf")
+
+
+def __getattr__(name: str) -> Any:
+    if name == "GIF_FONT":
+        return gif_font()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+Color = Tuple[int, int, int]
 
 
 class Colors:
@@ -16,70 +40,314 @@ class Colors:
     MAIN_FILL = (0, 255, 100)
     GREEN = (0, 255, 100)
 
+    @classmethod
+    def all(cls) -> list[Color]:
+        return [cls.BACKGROUND, cls.HIGHLIGHT, cls.MAIN_FILL, cls.GREEN]
+
+
+def palette_bytes(colors: Iterable[Color]) -> bytes:
+    """
+    Black (the color new frames start with) followed by the distinct colors
+    """
+    distinct = list(dict.fromkeys([(0, 0, 0), *colors]))
+    assert len(distinct) <= 256, "a gif palette holds 256 colors at most"
+    return bytes(channel for color in distinct for channel in color)
+
+
+class FrameSchedule:
+    """
+    Decides which steps of an animation become frames, every one by default
+    """
+
+    def wants(self, step: int) -> bool:
+        return True
+
 
 @dataclass
-class GifBuilder:
-    id: int
-    size: Tuple[int, int]
-    images: list[Image.Image]
+class EveryNth(FrameSchedule):
+    n: int
+
+    def wants(self, step: int) -> bool:
+        return step % self.n == 0
+
+
+@dataclass
+class Logarithmic(FrameSchedule):
+    """
+    Every step up to `base`, then every base-th step up to base², every base²-th...
+    but the stride stops growing before it would pass `max_stride`, if it is set
+    """
+
+    base: int = 10
+    max_stride: Optional[int] = None
+
+    def wants(self, step: int) -> bool:
+        stride = 1
+        while stride * self.base < step:
+            if self.max_stride is not None and stride * self.base > self.max_stride:
+                break
+            stride *= self.base
+        return step % stride == 0
+
+
+@dataclass
+class Budget(FrameSchedule):
+    """
+    Roughly `frames` frames spread evenly over an animation of about `steps` steps
+    """
+
+    frames: int
+    steps: int
+
+    def wants(self, step: int) -> bool:
+        return step % max(1, math.ceil(self.steps / self.frames)) == 0
 
 
 @dataclass
 class FrameInfo:
     frame_number: int
-    image: Image.Image
+    image: "Image.Image"
+
+
+Render = Callable[[FrameInfo, Any], None]
+
+
+def new_image(size: Tuple[int, int], palette: Optional[bytes]) -> "Image.Image":
+    from PIL import Image
+
+    if palette is None:
+        return Image.new("RGB", size, "black")
+    img = Image.new("P", size, 0)
+    img.putpalette(palette)
+    return img
+
+
+def render_image(
+    render: Render,
+    size: Tuple[int, int],
+    palette: Optional[bytes],
+    frame_number: int,
+    snapshot: Any,
+) -> "Image.Image":
+    img = new_image(size, palette)
+    render(FrameInfo(frame_number, img), snapshot)
+    return img
+
+
+@dataclass
+class GifBuilder:
+    id: int
+    size: Tuple[int, int]
+    dump: "FrameDump"
+    palette: Optional[bytes] = None
+    schedule: FrameSchedule = field(default_factory=FrameSchedule)
+    frame_count: int = 0
+    step_count: int = 0
+    # frames in order, either drawn here or still being rendered by the pool
+    queue: deque[Union["Image.Image", "Future"]] = field(default_factory=deque)
+
+    def wants(self, step: Optional[int], always: bool) -> bool:
+        if step is None:
+            step = self.step_count
+            self.step_count += 1
+        return always or self.schedule.wants(step)
+
+    def next_frame_number(self) -> int:
+        self.frame_count += 1
+        if self.frame_count % 100 == 0:
+            print(f"[VIS] Painted {self.frame_count} frames already.")
+        return self.frame_count
+
+    def flush(self, keep: int = 0):
+        """
+        Hands all but the last `keep` frames over to the dump
+
+        Callers draw on a requested frame until they request the next one,
+        so everything in the queue is done by the time this is called.
+        """
+        from concurrent.futures import Future
+
+        while len(self.queue) > keep:
+            frame = self.queue.popleft()
+            self.dump.add(frame.result() if isinstance(frame, Future) else frame)
 
 
 gif_counter: int = 0
 current_builder: Optional[GifBuilder] = None
+render_pool: Optional["ProcessPoolExecutor"] = None
 
 
 def is_drawing() -> bool:
     return "--paint" in sys.argv
 
 
-def initialize_gif(width: int, height: int):
+def animation_formats() -> list[str]:
+    """
+    File extensions to save animations as, set with --anim-format=webp,gif
+    """
+    for arg in sys.argv:
+        if arg.startswith("--anim-format="):
+            return arg.split("=", 1)[1].split(",")
+    return ["gif"]
+
+
+def render_workers() -> int:
+    """
+    How many processes render frames, set with --paint-jobs=N, one renders them inline
+    """
+    for arg in sys.argv:
+        if arg.startswith("--paint-jobs="):
+            return max(1, int(arg.split("=", 1)[1]))
+    return os.cpu_count() or 1
+
+
+def initialize_gif(
+    width: int,
+    height: int,
+    palette: Optional[Iterable[Color]] = None,
+    schedule: Optional[FrameSchedule] = None,
+):
+    """
+    Starts a new gif, the frames are RGB images unless a palette is given
+
+    With a palette, frames are "P" images with these colors, plus black.
+    ImageDraw still takes RGB fills on them, but they are much cheaper
+    to compare and encode since there is nothing to quantize.
+
+    The schedule picks the steps that are painted, request_frame and submit_frame
+    do nothing for the others. Steps are counted from 0 per request, unless the
+    caller passes its own (e.g. a simulation round).
+    """
     global current_builder
 
     current_builder = None
     if not is_drawing():
         print("[VIS] Won't paint this time. Set the --paint flag to paint the gif.")
         return
+
+    from aoc2022.encoders import FrameDump
+
     current_builder = GifBuilder(
-        id=increment_gif_counter(), size=(width, height), images=[]
+        id=increment_gif_counter(),
+        size=(width, height),
+        dump=FrameDump((width, height)),
+        palette=palette_bytes(palette) if palette is not None else None,
+        schedule=schedule or FrameSchedule(),
     )
 
 
-def request_frame() -> Optional[FrameInfo]:
+def request_frame(
+    step: Optional[int] = None, always: bool = False
+) -> Optional[FrameInfo]:
+    """
+    A blank frame to draw on, or None if not painting or the schedule skips the step
+
+    :param bool always: paint this frame whatever the schedule says
+    """
     global current_builder
 
-    if not current_builder:
+    if not current_builder or not current_builder.wants(step, always):
         return None
 
-    img = Image.new("RGB", current_builder.size, "black")
-    current_builder.images.append(img)
-    frame_count = len(current_builder.images)
-    if frame_count % 100 == 0:
-        print(f"[VIS] Painted {frame_count} frames already.")
-    return FrameInfo(frame_count, img)
+    current_builder.flush()
+    img = new_image(current_builder.size, current_builder.palette)
+    current_builder.queue.append(img)
+    return FrameInfo(current_builder.next_frame_number(), img)
+
+
+def submit_frame(
+    render: Render,
+    snapshot: Callable[[], Any],
+    step: Optional[int] = None,
+    always: bool = False,
+) -> bool:
+    """
+    Draws a frame with render(frame_info, state) in a worker process,
+    while the caller moves on with the simulation
+
+    Only the state is sent over, so it should be a small immutable copy.
+    The snapshot callback that makes it is only called when the frame is painted.
+    Frames end up in the gif in the order they were submitted.
+
+    :param Render render: a module level function, workers look it up by name
+    :return: whether a frame was submitted
+    """
+    global current_builder, render_pool
+
+    if not current_builder or not current_builder.wants(step, always):
+        return False
+
+    builder = current_builder
+    frame_number = builder.next_frame_number()
+    workers = render_workers()
+    if workers == 1:
+        builder.flush()
+        img = render_image(
+            render, builder.size, builder.palette, frame_number, snapshot()
+        )
+        builder.queue.append(img)
+        return True
+
+    if render_pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        render_pool = ProcessPoolExecutor(max_workers=workers)
+    builder.queue.append(
+        render_pool.submit(
+            render_image,
+            render,
+            builder.size,
+            builder.palette,
+            frame_number,
+            snapshot(),
+        )
+    )
+    # a few frames in flight per worker keep them busy without piling up images
+    builder.flush(keep=2 * workers)
+    return True
 
 
 def save_gif(output: Output, cleanup: bool = True, **kwargs):
-    global current_builder
+    """
+    Encodes the frames painted since initialize_gif
+
+    The format goes by the extension of the output if it has one, otherwise by
+    --anim-format (gif by default, several formats can be compared in one run).
+    kwargs are passed to the encoder, duration and loop work for all of them.
+    """
+    global current_builder, render_pool
     if not current_builder:
         return
 
-    if len(current_builder.images) < 1:
+    from aoc2022.encoders import ENCODERS
+
+    if current_builder.frame_count < 1:
         print("[VIS] Skipping an attempt to save a gif with zero frames.")
         return
 
-    path = output.request_path("gif")
-
-    images = current_builder.images
-    images[0].save(path, save_all=True, append_images=images[1:], **kwargs)
-    print(f"[VIS] Saved {len(images)} images")
+    current_builder.flush()
+    if render_pool is not None:
+        # every frame is in, the workers must not outlive the day
+        render_pool.shutdown(wait=True)
+        render_pool = None
+    dump = current_builder.dump
+    formats = [output.extension] if output.extension else animation_formats()
+    for format in formats:
+        if format not in ENCODERS:
+            raise ValueError(f"Cannot save .{format}, try one of {list(ENCODERS)}")
+    for format in formats:
+        path = output.request_path(format)
+        start = time.perf_counter()
+        ENCODERS[format](dump, path, **kwargs)
+        elapsed = time.perf_counter() - start
+        print(
+            f"[VIS] Saved {current_builder.frame_count} images"
+            f" as {len(dump.frames)} distinct frames to {path},"
+            f" {os.path.getsize(path) / 1024:.1f}KB encoded in {elapsed:.3f}s"
+        )
 
     if cleanup:
+        dump.close()
         current_builder = None
 
 
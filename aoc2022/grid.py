@@ -1,11 +1,161 @@
 from aoc2022.coords import Coords
-from aoc2022.gif import request_frame
-from PIL import ImageDraw
-from typing import Any, Callable, Generator, Generic, Optional, Tuple, TypeVar
+from aoc2022.gif import Color, request_frame
+from dataclasses import dataclass
+from array import array
+from functools import lru_cache
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Generic,
+    Iterable,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import struct
+import sys
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw
+
+    import numpy as np
 
 T = TypeVar("T")
 U = TypeVar("U")
 
+# binary grid files: magic, width, height, dtype length, dtype, zero padded to
+# GRID_ALIGN bytes, then the cells row by row
+GRID_MAGIC = b"AOCGRID1"
+GRID_HEADER = struct.Struct("<8sIIH")
+GRID_ALIGN = 64
+
+
+def paint_cells(
+    image: "Image.Image",
+    size: Tuple[int, int],
+    values: Iterable[Any],
+    colors: Mapping[Any, Union[Color, str]],
+    scale: int = 1,
+):
+    """
+    Paints a scale×scale block per cell, in the color its value maps to
+
+    The cells are turned into one pixel each with a single bulk call, then scaled
+    up without smoothing, so there is no Python work per cell besides the lookup.
+    On palette frames the lookup goes straight to palette indices.
+
+    :param Iterable values: one per cell, row by row
+    :param Mapping colors: RGB tuples, channels are clamped to 0..255 the way
+        ImageDraw clamps them, or color names PIL knows, e.g. "gold"
+    """
+    from PIL import Image
+
+    rgb = {value: rgb_color(color) for value, color in colors.items()}
+    if image.mode == "P":
+        assert image.palette is not None
+        index = {v: image.palette.getcolor(c, image) for v, c in rgb.items()}
+        raster = Image.frombytes("P", size, bytes(map(index.__getitem__, values)))
+    else:
+        pixels = {v: bytes(c) for v, c in rgb.items()}
+        raster = Image.frombytes("RGB", size, b"".join(map(pixels.__getitem__, values)))
+    if scale != 1:
+        width, height = size
+        raster = raster.resize(
+            (width * scale, height * scale), Image.Resampling.NEAREST
+        )
+    image.paste(raster)
+
+
+def rgb_color(color: Union[Color, str]) -> Color:
+    """
+    The color as an RGB tuple with every channel in 0..255
+    """
+    if isinstance(color, str):
+        from PIL import ImageColor
+
+        color = ImageColor.getrgb(color)[:3]
+    r, g, b = (min(max(channel, 0), 255) for channel in color[:3])
+    return r, g, b
+
+
+@dataclass
+class Neighbors:
+    """
+    Neighbor lists of every cell by flat index (y * width + x), in CSR layout
+
+    The neighbors of cell i are targets[offsets[i] : offsets[i + 1]]. ArrayGrid
+    keeps both as numpy arrays.
+    """
+
+    offsets: Union[Sequence[int], "np.ndarray"]
+    targets: Union[Sequence[int], "np.ndarray"]
+
+    def of(self, index: int) -> Union[Sequence[int], "np.ndarray"]:
+        return self.targets[self.offsets[index] : self.offsets[index + 1]]
+
+    def edges(self) -> Generator[Tuple[int, int], None, None]:
+        for index in range(len(self.offsets) - 1):
+            for target in self.of(index):
+                yield (index, int(target))
+
+
+NEIGHBOR_TABLES = 4  # grid sizes whose neighbor tables are kept
+
+
+@lru_cache(maxsize=NEIGHBOR_TABLES)
+def neighbor_table(width: int, height: int, diagonal: bool = False) -> Neighbors:
+    """
+    Neighbors of every cell of a width x height grid, shared between the grids
+    of the same size, so it must not be modified
+
+    The table is built with array operations and kept as two array("i"),
+    4 bytes per entry. Indexing them still gives plain ints.
+
+    :param bool diagonal: 8 neighbors instead of the 4 sharing an edge
+    """
+    import numpy as np
+
+    assert width * height < 2**31
+    steps = [
+        (dx, dy)
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+        if (dx or dy) and (diagonal or not (dx and dy))
+    ]
+    index = np.arange(width * height, dtype=np.intc)
+    xs, ys = index % width, index // width
+
+    # one column per step, the rows keep every cell's neighbors in step order
+    inside = np.empty((len(index), len(steps)), dtype=bool)
+    targets = np.empty((len(index), len(steps)), dtype=np.intc)
+    for i, (dx, dy) in enumerate(steps):
+        x_ok = (xs >= -dx) & (xs < width - dx)
+        inside[:, i] = x_ok & (ys >= -dy) & (ys < height - dy)
+        targets[:, i] = index + (dy * width + dx)
+
+    # summing the short rows directly is slower than adding up the columns
+    counts = np.zeros(len(index), dtype=np.intc)
+    for i in range(len(steps)):
+        counts += inside[:, i]
+    offsets = np.zeros(len(index) + 1, dtype=np.intc)
+    np.cumsum(counts, out=offsets[1:])
+    return Neighbors(_int_array(offsets), _int_array(targets[inside]))
+
+
+def _int_array(values: "np.ndarray") -> array:
+    result = array("i")
+    result.frombytes(values.data.cast("B"))
+    return result
+
 
 class Grid(Generic[T]):
     cells: list[list[T]]
@@ -34,19 +184,21 @@ class Grid(Generic[T]):
         )
 
     def get_by(self, coords: Coords) -> T:
-        return self[coords.x, coords.y]
+        x, y = coords
+        return self.cells[y][x]
 
     def set_by(self, coords: Coords, val: T):
-        self[coords.x, coords.y] = val
+        x, y = coords
+        self.cells[y][x] = val
 
     def row(self, y: int) -> list[T]:
         return self.cells[y]
 
     def col(self, x: int) -> list[T]:
-        return [self[x, y] for y in range(self.height)]
+        return [row[x] for row in self.cells]
 
     def all_cells(self) -> list[T]:
-        return [value for _, _, value in self.enumerate_all_cells()]
+        return list(chain.from_iterable(self.cells))
 
     def indexed(self, index: int) -> Tuple[int, int, T]:
         y, x = divmod(index, self.width)
@@ -56,9 +208,9 @@ class Grid(Generic[T]):
         return y * self.width + x
 
     def enumerate_all_cells(self) -> Generator[Tuple[int, int, T], None, None]:
-        for y in range(self.height):
-            for x in range(self.width):
-                yield (x, y, self[x, y])
+        for y, row in enumerate(self.cells):
+            for x, value in enumerate(row):
+                yield (x, y, value)
 
     def enumerate_neighbors(
         self, x: int, y: int
@@ -68,51 +220,617 @@ class Grid(Generic[T]):
                 if (x, y) != (xx, yy):
                     yield (xx, yy, self[xx, yy])
 
+    def neighbors(
+        self,
+        diagonal: bool = False,
+        predicate: Optional[Callable[[T, T], bool]] = None,
+    ) -> Neighbors:
+        """
+        Neighbor lists of every cell, see Neighbors
+
+        :param bool diagonal: 8 neighbors instead of the 4 sharing an edge
+        :param Callable predicate: keeps the neighbor if predicate(cell, neighbor)
+        """
+        table = neighbor_table(self.width, self.height, diagonal)
+        if predicate is None:
+            return table
+
+        cells = self.all_cells()
+        all_offsets, all_targets = table.offsets, table.targets
+        offsets = [0]
+        targets: list[int] = []
+        for index, value in enumerate(cells):
+            start, end = all_offsets[index], all_offsets[index + 1]
+            targets += [
+                target
+                for target in all_targets[start:end]
+                if predicate(value, cells[target])
+            ]
+            offsets.append(len(targets))
+        return Neighbors(offsets, targets)
+
     def map(self, mapper: Callable[[T], U]) -> "Grid[U]":
-        new_grid = Grid[U](self.width, self.height, mapper(self[0, 0]))
-        for x, y, value in self.enumerate_all_cells():
-            new_grid[x, y] = mapper(value)
-        return new_grid
+        return Grid.from_rows([[mapper(value) for value in row] for row in self.cells])
 
     def img_get_size(self, scale: int = 1) -> Tuple[int, int]:
         return self.width * scale, self.height * scale
 
     def img_draw(
-        self, color_map: Callable[[int, int, T], Any], scale: int = 1
-    ) -> Optional[ImageDraw.ImageDraw]:
+        self, color_map: Callable[[int, int, T], Color], scale: int = 1
+    ) -> Optional["ImageDraw.ImageDraw"]:
         frame_info = request_frame()
         if not frame_info:
             return None
 
-        img = frame_info.image
-        draw = ImageDraw.Draw(img)
-        for x, y, val in self.enumerate_all_cells():
-            coords = (x * scale, y * scale), (x * scale + scale, y * scale + scale)
-            draw.rectangle(coords, fill=color_map(x, y, val))
-        return draw
+        from PIL import ImageDraw
+
+        colors = [
+            color_map(x, y, val)
+            for y in range(self.height)
+            for x, val in enumerate(self.row(y))
+        ]
+        palette = {color: color for color in set(colors)}
+        paint_cells(frame_info.image, self.img_get_size(), colors, palette, scale)
+        return ImageDraw.Draw(frame_info.image)
+
+    def img_draw_values(
+        self, colors: Mapping[T, Color], scale: int = 1
+    ) -> Optional["ImageDraw.ImageDraw"]:
+        """
+        Like img_draw, for when the color only depends on the cell value
+        """
+        frame_info = request_frame()
+        if not frame_info:
+            return None
+
+        from PIL import ImageDraw
+
+        values = chain.from_iterable(self.row(y) for y in range(self.height))
+        paint_cells(frame_info.image, self.img_get_size(), values, colors, scale)
+        return ImageDraw.Draw(frame_info.image)
+
+    def view(self, origin: Coords, width: int, height: int) -> "Viewport[T]":
+        return Viewport(self, origin, width, height)
+
+    def to_array(self, dtype: Any = None) -> "ArrayGrid[T]":
+        """
+        A copy in an ArrayGrid, e.g. to save it
+
+        :param dtype: numpy dtype of the cells, guessed from the values by default
+        """
+        import numpy as np
+
+        return ArrayGrid.from_array(np.array(self.cells, dtype=dtype))
+
+    @classmethod
+    def from_rows(cls, rows: list[list[U]]) -> "Grid[U]":
+        """
+        Wraps the rows as they are, without copying
+
+        :param list rows: equally long rows, top to bottom
+        """
+        assert len(rows) > 0
+
+        grid: Grid[U] = Grid.__new__(Grid)
+        grid.width = len(rows[0])
+        grid.height = len(rows)
+        grid.cells = rows
+        return grid
 
     @classmethod
     def from_lines(cls, lines: list[str]) -> "Grid[str]":
         assert len(lines) > 0
+        return Grid.from_rows([list(line) for line in lines])
+
+
+class ArrayGrid(Grid[T]):
+    """
+    A Grid kept in one contiguous numpy array, cells[y, x]
 
-        height = len(lines)
-        width = len(lines[0])
-        grid = Grid(width, height, "")
+    Rows, columns and all_cells are views into the array instead of copies,
+    and map can hand a numeric mapper the whole array at once. Reading and
+    writing single cells is slower than with lists, so this pays off when the
+    grid is mostly worked on a row, a column or a whole array at a time.
+    """
 
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                grid[x, y] = char
+    cells: "np.ndarray"  # type: ignore[assignment]
 
+    def __init__(self, width: int, height: int, zero: T, dtype: Any = None):
+        import numpy as np
+
+        self.width = width
+        self.height = height
+        self.cells = np.full((height, width), zero, dtype=dtype)
+
+    def __getitem__(self, coord: Tuple[int, int]):
+        x, y = coord
+        return self.cells[y, x]
+
+    def __setitem__(self, coord: Tuple[int, int], value: T):
+        x, y = coord
+        self.cells[y, x] = value
+
+    def __repr__(self) -> str:
+        return "\n".join(
+            ["".join([repr(value) for value in row]) for row in self.cells.tolist()]
+        )
+
+    def get_by(self, coords: Coords) -> T:
+        x, y = coords
+        return self.cells[y, x]
+
+    def set_by(self, coords: Coords, val: T):
+        x, y = coords
+        self.cells[y, x] = val
+
+    def row(self, y: int) -> "np.ndarray":  # type: ignore[override]
+        return self.cells[y]
+
+    def col(self, x: int) -> "np.ndarray":  # type: ignore[override]
+        return self.cells[:, x]
+
+    def all_cells(self) -> "np.ndarray":  # type: ignore[override]
+        return self.cells.reshape(-1)
+
+    def enumerate_all_cells(self) -> Generator[Tuple[int, int, T], None, None]:
+        for y, row in enumerate(self.cells.tolist()):
+            for x, value in enumerate(row):
+                yield (x, y, value)
+
+    @overload  # type: ignore[override]
+    def map(
+        self, mapper: Callable[[Any], Any], vectorized: Literal[False] = False
+    ) -> Grid[Any]:
+        ...
+
+    @overload
+    def map(
+        self, mapper: Callable[[Any], Any], vectorized: Literal[True]
+    ) -> "ArrayGrid[Any]":
+        ...
+
+    def map(
+        self, mapper: Callable[[Any], Any], vectorized: bool = False
+    ) -> Union[Grid[Any], "ArrayGrid[Any]"]:
+        """
+        :param Callable mapper: called per cell, the result is a list backed Grid
+        :param bool vectorized: call the mapper once with the whole array instead,
+            e.g. lambda a: a - ord("0"), the result is another ArrayGrid
+        """
+        if vectorized:
+            import numpy as np
+
+            mapped = np.asarray(mapper(self.cells))
+            assert mapped.shape == self.cells.shape
+            return ArrayGrid.from_array(mapped)
+        rows = self.cells.tolist()
+        return Grid.from_rows([[mapper(value) for value in row] for row in rows])
+
+    def neighbors(
+        self,
+        diagonal: bool = False,
+        predicate: Optional[Callable[[Any, Any], Any]] = None,
+    ) -> Neighbors:
+        """
+        Like Grid.neighbors, with the table as arrays
+
+        The predicate is called once, with the values of every cell and neighbor
+        pair as two arrays, and returns a boolean array, e.g.
+        lambda cell, neighbor: neighbor <= cell + 1
+        """
+        import numpy as np
+
+        table = neighbor_table(self.width, self.height, diagonal)
+        # views of the shared table, nothing is copied
+        offsets = np.asarray(table.offsets, dtype=np.intc)
+        targets = np.asarray(table.targets, dtype=np.intc)
+        if predicate is None:
+            return Neighbors(offsets, targets)
+
+        values = self.cells.reshape(-1)
+        sources = np.repeat(np.arange(len(values)), np.diff(offsets))
+        keep = np.asarray(predicate(values[sources], values[targets]), dtype=bool)
+        counts = np.bincount(sources[keep], minlength=len(values))
+        return Neighbors(np.concatenate(([0], np.cumsum(counts))), targets[keep])
+
+    def img_draw_values(
+        self, colors: Mapping[T, Color], scale: int = 1
+    ) -> Optional["ImageDraw.ImageDraw"]:
+        frame_info = request_frame()
+        if not frame_info:
+            return None
+
+        from PIL import ImageDraw
+
+        values = self.cells.reshape(-1).tolist()
+        paint_cells(frame_info.image, self.img_get_size(), values, colors, scale)
+        return ImageDraw.Draw(frame_info.image)
+
+    def to_grid(self) -> Grid[T]:
+        return Grid.from_rows(self.cells.tolist())
+
+    def save(self, path: str):
+        """
+        Writes the grid as a binary grid file, which load maps back in
+
+        Only numeric and fixed size string cells have a binary form.
+        """
+        import numpy as np
+
+        assert self.cells.dtype.kind != "O", "object cells cannot be saved"
+
+        dtype = self.cells.dtype.str.encode()
+        header = GRID_HEADER.pack(GRID_MAGIC, self.width, self.height, len(dtype))
+        header += dtype
+        header += bytes(-len(header) % GRID_ALIGN)
+        with open(path, mode="wb") as f:
+            f.write(header)
+            np.ascontiguousarray(self.cells).tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "ArrayGrid[Any]":
+        """
+        Maps a binary grid file written by save into memory
+
+        Only the header is read, the cells are loaded by the OS as they are
+        touched. Writes go to private copies of the pages, the file is left as it is.
+        """
+        import numpy as np
+
+        with open(path, mode="rb") as f:
+            header = f.read(GRID_ALIGN)
+        magic, width, height, length = GRID_HEADER.unpack_from(header)
+        assert magic == GRID_MAGIC, f"{path} is not a grid file"
+        assert width > 0 and height > 0  # empty files cannot be mapped
+
+        start = GRID_HEADER.size
+        dtype = np.dtype(header[start : start + length].decode())
+        offset = start + length + -(start + length) % GRID_ALIGN
+        cells = np.memmap(path, dtype, mode="c", offset=offset, shape=(height, width))
+        return ArrayGrid.from_array(cells)
+
+    @classmethod
+    def from_array(cls, array: "np.ndarray") -> "ArrayGrid[Any]":
+        """
+        Wraps a 2D array as it is, without copying
+        """
+        assert array.ndim == 2
+
+        grid: ArrayGrid[Any] = ArrayGrid.__new__(ArrayGrid)
+        grid.height, grid.width = array.shape
+        grid.cells = array
         return grid
 
+    @classmethod
+    def from_bytes(cls, data: Any) -> "ArrayGrid[int]":
+        """
+        The byte values of equally long lines, e.g. ord("#") for a "#"
+
+        The array is laid over the buffer with a stride that steps over the
+        line endings, nothing is copied. It is read-only if the buffer is.
+
+        :param data: bytes, bytearray, mmap, ... with "\\n" or "\\r\\n" line endings
+        """
+        import numpy as np
+
+        size = len(data)
+        while size and data[size - 1] in b"\r\n":
+            size -= 1
+        newline = data.find(b"\n")
+        if newline < 0 or newline > size:
+            width, ending = size, 1
+        else:
+            ending = 2 if newline > 0 and data[newline - 1] == ord("\r") else 1
+            width = newline - (ending - 1)
+        height = (size + ending) // (width + ending)
+        assert height * (width + ending) - ending == size, "lines are not equally long"
+
+        array = np.ndarray(
+            (height, width),
+            dtype=np.uint8,
+            buffer=data,
+            strides=(width + ending, 1),
+        )
+        return ArrayGrid.from_array(array)
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "ArrayGrid[str]":
+        """
+        One character per cell, like Grid.from_lines
+        """
+        import numpy as np
+
+        assert len(lines) > 0
+        assert all(len(line) == len(lines[0]) for line in lines)
+
+        # one string per line, each line's characters viewed as separate cells
+        chars = np.array(lines).view("U1").reshape(len(lines), len(lines[0]))
+        return ArrayGrid.from_array(chars)
+
+
+CHUNK_BITS = 5
+CHUNK_SIZE = 1 << CHUNK_BITS  # SparseGrid chunks are CHUNK_SIZE cells square
+CHUNK_MASK = CHUNK_SIZE - 1
+
+
+class SparseGrid(Generic[T]):
+    """
+    An unbounded grid, kept as square chunks that are allocated on first write
+
+    Cells that were never written read as zero. Coordinates can be negative,
+    memory grows with the area that was written to, and the bounding box of
+    the written cells is kept as they are written.
+    """
+
+    zero: T
+    chunks: dict[Tuple[int, int], list[T]]
+    min_x: int
+    min_y: int
+    max_x: int
+    max_y: int
+
+    def __init__(self, zero: T):
+        self.zero = zero
+        self.chunks = {}
+        self.min_x = self.min_y = sys.maxsize
+        self.max_x = self.max_y = -sys.maxsize
+
+    def __getitem__(self, coord: Tuple[int, int]):
+        x, y = coord
+        chunk = self.chunks.get((x >> CHUNK_BITS, y >> CHUNK_BITS))
+        if chunk is None:
+            return self.zero
+        return chunk[((y & CHUNK_MASK) << CHUNK_BITS) | (x & CHUNK_MASK)]
+
+    def __setitem__(self, coord: Tuple[int, int], value: T):
+        x, y = coord
+        key = (x >> CHUNK_BITS, y >> CHUNK_BITS)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = [self.zero] * (CHUNK_SIZE * CHUNK_SIZE)
+        chunk[((y & CHUNK_MASK) << CHUNK_BITS) | (x & CHUNK_MASK)] = value
+
+        if not (self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y):
+            self.min_x, self.max_x = min(self.min_x, x), max(self.max_x, x)
+            self.min_y, self.max_y = min(self.min_y, y), max(self.max_y, y)
+
+    def __repr__(self) -> str:
+        return repr(self.to_grid())
+
+    @property
+    def width(self) -> int:
+        return max(0, self.max_x - self.min_x + 1)
+
+    @property
+    def height(self) -> int:
+        return max(0, self.max_y - self.min_y + 1)
+
+    # a Coords is a tuple already, skip the extra call
+    get_by = __getitem__
+    set_by = __setitem__
+
+    def bounds(self) -> Tuple[Coords, Coords]:
+        """
+        Top left and bottom right corners of the written cells, inclusive
+        """
+        assert self.chunks, "nothing was written yet"
+        return Coords(self.min_x, self.min_y), Coords(self.max_x, self.max_y)
+
+    def row(self, y: int) -> list[T]:
+        """
+        The cells of a row between the left and right edges of the bounding box
+        """
+        start = (y & CHUNK_MASK) << CHUNK_BITS
+        blank = [self.zero] * CHUNK_SIZE
+
+        cells: list[T] = []
+        for cx in range(self.min_x >> CHUNK_BITS, (self.max_x >> CHUNK_BITS) + 1):
+            chunk = self.chunks.get((cx, y >> CHUNK_BITS))
+            cells += blank if chunk is None else chunk[start : start + CHUNK_SIZE]
+        skip = self.min_x & CHUNK_MASK
+        return cells[skip : skip + self.width]
+
+    def enumerate_all_cells(self) -> Generator[Tuple[int, int, T], None, None]:
+        """
+        Every cell of the bounding box, written or not
+        """
+        for y in range(self.min_y, self.max_y + 1):
+            for x, value in enumerate(self.row(y), self.min_x):
+                yield (x, y, value)
+
+    def enumerate_neighbors(
+        self, x: int, y: int
+    ) -> Generator[Tuple[int, int, T], None, None]:
+        for yy in range(y - 1, y + 2):
+            for xx in range(x - 1, x + 2):
+                if (x, y) != (xx, yy):
+                    yield (xx, yy, self[xx, yy])
+
+    def count(self, value: T) -> int:
+        """
+        How many cells hold the value, which cannot be zero
+        """
+        assert value != self.zero
+        return sum(chunk.count(value) for chunk in self.chunks.values())
+
+    def to_grid(self) -> Grid[T]:
+        """
+        A dense copy of the bounding box, its top left corner becomes (0, 0)
+        """
+        return Grid.from_rows([self.row(y) for y in range(self.min_y, self.max_y + 1)])
+
+
+class BitGrid:
+    """
+    A grid of booleans, one int per row with bit x set for column x
+
+    Counting, shifting and combining work on whole rows at a time, so a
+    10000x10000 grid takes 12.5MB and an operation on it runs 10000 int
+    operations instead of 100 million cell updates. Single cells are slower
+    to read than in a Grid, every read shifts the row.
+    """
+
+    width: int
+    height: int
+    rows: list[int]
+
+    def __init__(self, width: int, height: int, rows: Optional[list[int]] = None):
+        self.width = width
+        self.height = height
+        self.rows = rows if rows is not None else [0] * height
+        assert len(self.rows) == height
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.width) - 1
+
+    def __getitem__(self, coord: Tuple[int, int]) -> bool:
+        x, y = coord
+        return bool(self.rows[y] >> x & 1)
+
+    def __setitem__(self, coord: Tuple[int, int], value: bool):
+        x, y = coord
+        if value:
+            self.rows[y] |= 1 << x
+        else:
+            self.rows[y] &= ~(1 << x)
+
+    def __repr__(self) -> str:
+        return "\n".join(
+            format(row, f"0{self.width}b")[::-1].replace("0", ".").replace("1", "#")
+            for row in self.rows
+        )
+
+    # a Coords is a tuple already, skip the extra call
+    get_by = __getitem__
+    set_by = __setitem__
+
+    def count(self) -> int:
+        return sum(row.bit_count() for row in self.rows)
+
+    def _combine(self, other: "BitGrid", op: Callable[[int, int], int]) -> "BitGrid":
+        assert (self.width, self.height) == (other.width, other.height)
+        return BitGrid(self.width, self.height, list(map(op, self.rows, other.rows)))
+
+    def __and__(self, other: "BitGrid") -> "BitGrid":
+        return self._combine(other, int.__and__)
+
+    def __or__(self, other: "BitGrid") -> "BitGrid":
+        return self._combine(other, int.__or__)
+
+    def __xor__(self, other: "BitGrid") -> "BitGrid":
+        return self._combine(other, int.__xor__)
+
+    def __invert__(self) -> "BitGrid":
+        mask = self.mask
+        return BitGrid(self.width, self.height, [row ^ mask for row in self.rows])
+
+    def andnot(self, other: "BitGrid") -> "BitGrid":
+        """
+        The cells set here but not in the other grid
+        """
+        assert (self.width, self.height) == (other.width, other.height)
+        rows = [a & ~b for a, b in zip(self.rows, other.rows)]
+        return BitGrid(self.width, self.height, rows)
+
+    def shift(self, dx: int, dy: int) -> "BitGrid":
+        """
+        Moves every cell by (dx, dy), what moves past the edges is dropped
+        """
+        mask = self.mask
+        if dx >= 0:
+            rows = [(row << dx) & mask for row in self.rows]
+        else:
+            rows = [row >> -dx for row in self.rows]
+
+        blank = [0] * min(abs(dy), self.height)
+        if dy > 0:
+            rows = blank + rows[: self.height - dy]
+        elif dy < 0:
+            rows = rows[-dy:] + blank
+        return BitGrid(self.width, self.height, rows)
+
+    def smear(self, dx: int, dy: int) -> "BitGrid":
+        """
+        Also sets every cell that comes after a set cell in a direction
+
+        :param int dx: -1, 0 or 1
+        :param int dy: -1, 0 or 1, when both are set the smear goes horizontally
+            then vertically, not diagonally
+        """
+        rows = self.rows
+        step = 1
+        while dx and step < self.width:
+            if dx > 0:
+                mask = self.mask
+                rows = [row | (row << step) & mask for row in rows]
+            else:
+                rows = [row | row >> step for row in rows]
+            step *= 2
+        if dy:
+            order = rows if dy > 0 else rows[::-1]
+            acc = 0
+            swept = []
+            for row in order:
+                acc |= row
+                swept.append(acc)
+            rows = swept if dy > 0 else swept[::-1]
+        return BitGrid(self.width, self.height, list(rows))
+
+    @classmethod
+    def from_lines(cls, lines: list[str], on: str) -> "BitGrid":
+        """
+        Sets the cells whose character is one of on
+
+        :param list lines: equally long ASCII lines
+        """
+        assert len(lines) > 0
+
+        # every character becomes a 0 or 1 digit, a reversed row is its int in base 2
+        table = bytes(ord("1") if chr(b) in on else ord("0") for b in range(256))
+        rows = [int(line.encode().translate(table)[::-1] or b"0", 2) for line in lines]
+        return BitGrid(len(lines[0]), len(lines), rows)
+
+    @classmethod
+    def from_array(cls, array: "np.ndarray") -> "BitGrid":
+        """
+        Sets the cells that are true in a 2D array, e.g. heights.cells >= 5
+        """
+        import numpy as np
+
+        height, width = array.shape
+        packed = np.packbits(array, axis=1, bitorder="little")
+        rows = [int.from_bytes(row.tobytes(), "little") for row in packed]
+        return BitGrid(width, height, rows)
+
 
 class Viewport(Generic[T]):
+    """
+    A rectangle of a Grid, addressed from its own top left corner
+
+    Nothing is copied, reads and writes go to the grid. Rows are slices of the
+    grid rows, which makes them views on an ArrayGrid. A viewport of a viewport
+    is a viewport of the same grid, so nesting costs nothing per access.
+    """
+
     underlying: Grid[T]
     origin: Coords
     width: int
     height: int
 
-    def __init__(self, grid: Grid[T], origin: Coords, width: int, height: int):
+    def __init__(
+        self,
+        grid: Union[Grid[T], "Viewport[T]"],
+        origin: Coords,
+        width: int,
+        height: int,
+    ):
+        if isinstance(grid, Viewport):
+            origin = grid.origin + origin
+            grid = grid.underlying
+        assert 0 <= origin.x and origin.x + width <= grid.width
+        assert 0 <= origin.y and origin.y + height <= grid.height
+
         self.underlying = grid
         self.origin = origin
         self.width = width
@@ -120,34 +838,44 @@ class Viewport(Generic[T]):
 
     def __getitem__(self, coord: Tuple[int, int]):
         x, y = coord
-        return self.underlying[x + self.origin.x, y + self.origin.y]
+        ox, oy = self.origin
+        return self.underlying[x + ox, y + oy]
 
     def __setitem__(self, coord: Tuple[int, int], value: T):
         x, y = coord
-        self.underlying[x + self.origin.x, y + self.origin.y] = value
+        ox, oy = self.origin
+        self.underlying[x + ox, y + oy] = value
 
     def __repr__(self) -> str:
         return "\n".join(
-            [
-                "".join([repr(self[x, y]) for x in range(self.width)])
-                for y in range(self.height)
-            ]
+            ["".join([repr(value) for value in row]) for row in self.rows()]
         )
 
     def get_by(self, coords: Coords) -> T:
-        return self[coords.x, coords.y]
+        x, y = coords
+        return self[x, y]
 
     def set_by(self, coords: Coords, val: T):
-        self[coords.x, coords.y] = val
+        x, y = coords
+        self[x, y] = val
 
     def row(self, y: int) -> list[T]:
-        return [self[x, y] for x in range(self.width)]
+        x = self.origin.x
+        return self.underlying.row(y + self.origin.y)[x : x + self.width]
+
+    def rows(self) -> list[list[T]]:
+        x, y = self.origin
+        return [
+            self.underlying.row(yy)[x : x + self.width]
+            for yy in range(y, y + self.height)
+        ]
 
     def col(self, x: int) -> list[T]:
-        return [self[x, y] for y in range(self.height)]
+        y = self.origin.y
+        return self.underlying.col(x + self.origin.x)[y : y + self.height]
 
     def all_cells(self) -> list[T]:
-        return [value for _, _, value in self.enumerate_all_cells()]
+        return list(chain.from_iterable(self.rows()))
 
     def indexed(self, index: int) -> Tuple[int, int, T]:
         y, x = divmod(index, self.width)
@@ -157,9 +885,9 @@ class Viewport(Generic[T]):
         return y * self.width + x
 
     def enumerate_all_cells(self) -> Generator[Tuple[int, int, T], None, None]:
-        for y in range(self.height):
-            for x in range(self.width):
-                yield (x, y, self[x, y])
+        for y, row in enumerate(self.rows()):
+            for x, value in enumerate(row):
+                yield (x, y, value)
 
     def enumerate_neighbors(
         self, x: int, y: int
@@ -170,24 +898,74 @@ class Viewport(Generic[T]):
                     yield (xx, yy, self[xx, yy])
 
     def map(self, mapper: Callable[[T], U]) -> "Grid[U]":
-        new_grid = Grid[U](self.width, self.height, mapper(self[0, 0]))
-        for x, y, value in self.enumerate_all_cells():
-            new_grid[x, y] = mapper(value)
-        return new_grid
+        return Grid.from_rows([[mapper(value) for value in row] for row in self.rows()])
+
+    def view(self, origin: Coords, width: int, height: int) -> "Viewport[T]":
+        return Viewport(self, origin, width, height)
+
+    def fill(self, value: T):
+        """
+        Sets every cell of the viewport, a row slice at a time
+        """
+        x, y = self.origin
+        line = [value] * self.width
+        for yy in range(y, y + self.height):
+            self.underlying.row(yy)[x : x + self.width] = line
+
+    def copy_from(self, source: Union[Grid[T], "Viewport[T]"]):
+        """
+        Copies the top left corner of the source over the viewport
+
+        The source has to be at least as large. Rows are copied top to bottom,
+        so if both are in the same grid and overlap, the viewport cannot be
+        lower than the source.
+        """
+        assert source.width >= self.width and source.height >= self.height
+
+        x, y = self.origin
+        for yy in range(self.height):
+            line = source.row(yy)[: self.width]
+            self.underlying.row(y + yy)[x : x + self.width] = line
+
+    def to_grid(self) -> Grid[T]:
+        """
+        A copy of the viewport as a list backed Grid of its own
+        """
+        return Grid.from_rows([list(row) for row in self.rows()])
 
     def img_get_size(self, scale: int = 1) -> Tuple[int, int]:
         return self.width * scale, self.height * scale
 
     def img_draw(
-        self, color_map: Callable[[int, int, T], Any], scale: int = 1
-    ) -> Optional[ImageDraw.ImageDraw]:
+        self, color_map: Callable[[int, int, T], Color], scale: int = 1
+    ) -> Optional["ImageDraw.ImageDraw"]:
         frame_info = request_frame()
         if not frame_info:
             return None
 
-        img = frame_info.image
-        draw = ImageDraw.Draw(img)
-        for x, y, val in self.enumerate_all_cells():
-            coords = (x * scale, y * scale), (x * scale + scale, y * scale + scale)
-            draw.rectangle(coords, fill=color_map(x, y, val))
-        return draw
+        from PIL import ImageDraw
+
+        colors = [
+            color_map(x, y, val)
+            for y in range(self.height)
+            for x, val in enumerate(self.row(y))
+        ]
+        palette = {color: color for color in set(colors)}
+        paint_cells(frame_info.image, self.img_get_size(), colors, palette, scale)
+        return ImageDraw.Draw(frame_info.image)
+
+    def img_draw_values(
+        self, colors: Mapping[T, Color], scale: int = 1
+    ) -> Optional["ImageDraw.ImageDraw"]:
+        """
+        Like img_draw, for when the color only depends on the cell value
+        """
+        frame_info = request_frame()
+        if not frame_info:
+            return None
+
+        from PIL import ImageDraw
+
+        values = chain.from_iterable(self.row(y) for y in range(self.height))
+        paint_cells(frame_info.image, self.img_get_size(), values, colors, scale)
+        return ImageDraw.Draw(frame_info.image)
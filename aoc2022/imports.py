@@ -0,0 +1,82 @@
+from aoc2022.registry import available_days
+from dataclasses import dataclass
+
+import argparse
+import subprocess
+import sys
+
+
+@dataclass
+class ImportCost:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def import_costs(statement: str) -> dict[str, ImportCost]:
+    """
+    Runs a statement in a fresh interpreter with -X importtime
+
+    :param str statement: e.g. "import aoc2022.day5"
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    costs: dict[str, ImportCost] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line.replace("import time:", "").split("|")
+        name = module.strip()
+        costs[name] = ImportCost(name, int(self_us), int(cumulative_us))
+    return costs
+
+
+def cold_start_cost(module: str, startup: set[str]) -> list[ImportCost]:
+    """
+    What importing the module costs on top of the interpreter startup,
+    most expensive imports first
+    """
+    costs = import_costs(f"import {module}")
+    own = [cost for name, cost in costs.items() if name not in startup]
+    own.sort(key=lambda cost: cost.self_us, reverse=True)
+    return own
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2022.imports",
+        description="Checks the cold import time of every day against a budget",
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to check, default all")
+    parser.add_argument(
+        "--budget", type=float, default=75, help="milliseconds allowed per day"
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="how many of the costliest imports to list"
+    )
+    args = parser.parse_args()
+
+    startup = set(import_costs("pass"))
+    over_budget = []
+    for day in args.days or available_days():
+        module = f"aoc2022.day{day}"
+        own = cold_start_cost(module, startup)
+        total_ms = sum(cost.self_us for cost in own) / 1000
+        verdict = "ok" if total_ms <= args.budget else "OVER BUDGET"
+        print(f"[IMP] {module}: {total_ms:.1f}ms {verdict}")
+        for cost in own[: args.top]:
+            print(f"    {cost.self_us / 1000:8.1f}ms  {cost.module}")
+        if total_ms > args.budget:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"[IMP] {len(over_budget)} over the {args.budget}ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional
+
+import json
+import sys
+import time
+
+
+def is_instrumenting() -> bool:
+    return "--instrument" in sys.argv
+
+
+def logged_channels() -> list[str]:
+    """
+    Channel names (or prefixes) switched on with --log=name, e.g. --log=day11.debug
+    """
+    return [arg.split("=", 1)[1] for arg in sys.argv if arg.startswith("--log=")]
+
+
+class Channel:
+    """
+    Log events that are only formatted when the channel is enabled
+
+    Hot loops should check `enabled` once outside of the loop and skip the calls entirely.
+    """
+
+    name: str
+    enabled: bool
+
+    def __init__(self, name: str, enabled: bool = False):
+        self.name = name
+        self.enabled = enabled or any(name.startswith(c) for c in logged_channels())
+
+    def __call__(self, indent: int, text: str, *args: Any):
+        if self.enabled:
+            print(" " * indent + (text.format(*args) if args else text))
+
+
+class Counter:
+    name: str
+    value: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def add(self, amount: int = 1):
+        self.value += amount
+
+
+class NullCounter(Counter):
+    def add(self, amount: int = 1):
+        pass
+
+
+class Timer:
+    name: str
+    count: int
+    seconds: float
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.seconds = 0.0
+        self._start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.seconds += time.perf_counter() - self._start
+        self.count += 1
+
+
+NULL_COUNTER = NullCounter("null")
+counters: dict[str, Counter] = {}
+timers: dict[str, Timer] = {}
+
+
+def channel(name: str, enabled: bool = False) -> Channel:
+    return Channel(name, enabled)
+
+
+def counter(name: str) -> Counter:
+    """
+    A named counter, or a shared no-op one when --instrument is off
+    """
+    if not is_instrumenting():
+        return NULL_COUNTER
+    if name not in counters:
+        counters[name] = Counter(name)
+    return counters[name]
+
+
+def timer(name: str) -> ContextManager:
+    """
+    Adds the time spent in the with block to a named timer when --instrument is on
+    """
+    if not is_instrumenting():
+        return nullcontext()
+    if name not in timers:
+        timers[name] = Timer(name)
+    return timers[name]
+
+
+def totals() -> dict[str, Any]:
+    return {
+        "counters": {name: c.value for name, c in counters.items()},
+        "timers": {
+            name: {"count": t.count, "seconds": t.seconds} for name, t in timers.items()
+        },
+    }
+
+
+def export(path: Optional[str] = None, reset: bool = True):
+    """
+    Prints the counter and timer totals, and writes them as JSON if a path is given
+
+    Resetting zeroes the totals but keeps the counters and timers registered,
+    modules usually hold on to them.
+    """
+    if not counters and not timers:
+        return
+
+    for name, c in counters.items():
+        print(f"[INS] {name}: {c.value}")
+    for name, t in timers.items():
+        print(f"[INS] {name}: {t.seconds:.3f}s in {t.count} runs")
+
+    if path:
+        with open(path, mode="w") as f:
+            json.dump(totals(), f, indent=2)
+
+    if reset:
+        for c in counters.values():
+            c.value = 0
+        for t in timers.values():
+            t.count, t.seconds = 0, 0.0
@@ -0,0 +1,162 @@
+from functools import cache
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+import re
+
+if TYPE_CHECKING:
+    import numpy as np
+
+INT = r"-?\d+"
+UINT = r"\d+"
+
+_INT = re.compile(INT)
+_UINT = re.compile(UINT)
+
+MAX_DIGITS = 18  # every 18 digit number fits in an int64
+
+
+def ints(text: str, signed: bool = True) -> list[int]:
+    """
+    All integers in the text, in order, e.g. [2, 18, -2, 15] for
+    "Sensor at x=2, y=18: closest beacon is at x=-2, y=15"
+
+    :param bool signed: a "-" right before the digits makes the number negative,
+        turn it off where "-" separates numbers, like "2-4"
+    """
+    return list(map(int, (_INT if signed else _UINT).findall(text)))
+
+
+def tokens(text: str, pattern: str) -> list[str]:
+    """
+    All matches of a regular expression, e.g. the valve names of a day16 line
+    """
+    return _compiled(pattern).findall(text)
+
+
+@cache
+def _compiled(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def ints_array(data: Any, signed: bool = True, dtype: Any = None) -> "np.ndarray":
+    """
+    All integers of a whole buffer at once, straight into an array
+
+    The digits are found and combined with array operations, no string or int
+    object is made per number. Numbers can have up to MAX_DIGITS digits.
+
+    :param data: bytes, bytearray, mmap, ... or a str, which is encoded first
+    :param bool signed: as in ints
+    :param dtype: of the result, int64 by default
+    """
+    import numpy as np
+
+    if isinstance(data, str):
+        data = data.encode()
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if len(raw) == 0:
+        return np.zeros(0, dtype=dtype or np.int64)
+
+    # bytes below "0" wrap around to large values
+    digits = raw - ord("0")
+    is_digit = digits < 10
+
+    # runs of digits start and end where is_digit flips
+    bounds = np.flatnonzero(is_digit[1:] != is_digit[:-1]) + 1
+    if is_digit[0]:
+        bounds = np.concatenate(([0], bounds))
+    if is_digit[-1]:
+        bounds = np.append(bounds, len(raw))
+    starts = bounds[0::2]
+    lengths = bounds[1::2] - starts
+    if len(starts) == 0:
+        return np.zeros(0, dtype=dtype or np.int64)
+    longest = int(lengths.max())
+    assert longest <= MAX_DIGITS, "number too long for an int64"
+
+    # one pass per digit place, over all the numbers that are long enough
+    numbers = np.zeros(len(starts), dtype=np.int64)
+    for place in range(longest):
+        more = place < lengths
+        digit = np.take(digits, starts + place, mode="clip")
+        np.multiply(numbers, 10, out=numbers, where=more)
+        np.add(numbers, digit, out=numbers, where=more)
+
+    if signed:
+        before = starts - 1
+        negative = (before >= 0) & (raw[before] == ord("-"))
+        numbers[negative] *= -1
+    return numbers.astype(dtype or np.int64, copy=False)
+
+
+class Fields:
+    """
+    A line format with {name} holes, e.g. "move {count} from {source} to {target}"
+
+    Holes match signed integers and are converted to int, unless the hole is
+    given its own pattern, then the matched text is kept. Everything between
+    the holes has to be there exactly.
+    """
+
+    names: tuple[str, ...]
+    regex: re.Pattern
+
+    def __init__(self, template: str, **patterns: str):
+        parts = []
+        names = []
+        for literal, name, _, _ in Formatter().parse(template):
+            parts.append(re.escape(literal))
+            if name is not None:
+                names.append(name)
+                parts.append(f"({patterns.get(name, INT)})")
+        self.names = tuple(names)
+        self.regex = re.compile("".join(parts))
+        self._converters: list[Callable[[str], Any]] = [
+            str if name in patterns else int for name in names
+        ]
+
+    def __repr__(self) -> str:
+        return f"Fields({self.regex.pattern!r})"
+
+    def match(self, text: str) -> Optional[tuple[Any, ...]]:
+        """
+        The fields of the first match in the text, None if there is none
+        """
+        found = self.regex.search(text)
+        if found is None:
+            return None
+        return tuple(
+            convert(value) for convert, value in zip(self._converters, found.groups())
+        )
+
+    def parse(self, text: str) -> tuple[Any, ...]:
+        fields = self.match(text)
+        assert fields is not None, f"{text!r} does not match {self}"
+        return fields
+
+    def parse_all(self, text: str) -> Iterator[tuple[Any, ...]]:
+        """
+        The fields of every match in a whole input, found in one pass
+        """
+        converters = self._converters
+        for found in self.regex.finditer(text):
+            yield tuple(
+                convert(value) for convert, value in zip(converters, found.groups())
+            )
+
+    def array(self, text: str, dtype: Any = None) -> "np.ndarray":
+        """
+        Every match in a whole input as an array row, for formats of only integers
+
+        :param dtype: of the result, int64 by default
+        """
+        import numpy as np
+
+        assert all(convert is int for convert in self._converters)
+
+        found = self.regex.findall(text)
+        if not found:
+            return np.zeros((0, len(self.names)), dtype=dtype or np.int64)
+        columns = np.array(found, dtype=str).reshape(len(found), len(self.names))
+        return columns.astype(dtype or np.int64)
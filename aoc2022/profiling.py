@@ -0,0 +1,97 @@
+from aoc2022.util import Output
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Tuple
+
+import os
+import sys
+
+# the profiler is loaded when --profile is set
+if TYPE_CHECKING:
+    import pstats
+
+Function = Tuple[str, int, str]  # file, line, name as pstats has them
+
+# paths that contribute less than this are left out of the collapsed stacks
+MIN_STACK_US = 1
+
+
+def is_profiling() -> bool:
+    return "--profile" in sys.argv
+
+
+def profiled(input_path: str, phase: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs fn(*args) under cProfile if --profile is set, and writes its stats
+
+    Two files per phase go to output/dayN: the stats sorted by cumulative time,
+    and the call stacks in collapsed format (for flamegraph.pl, speedscope, ...).
+
+    :param str input_path: the input file the phase works on, names the output
+    :param str phase: "parse", "p1", "p2", ...
+    """
+    if not is_profiling():
+        return fn(*args)
+
+    import cProfile
+    import pstats
+
+    profile = cProfile.Profile()
+    result = profile.runcall(fn, *args)
+    stats = pstats.Stats(profile)
+
+    stem = os.path.basename(input_path).replace(".txt", "")
+    stats_path = Output.create(name=f"{stem}_{phase}_stats").request_path()
+    with open(stats_path, mode="w") as f:
+        stats.stream = f  # type: ignore
+        stats.sort_stats("cumulative").print_stats()
+
+    collapsed_path = Output.create(name=f"{stem}_{phase}").request_path("collapsed")
+    with open(collapsed_path, mode="w") as f:
+        for stack, us in collapsed_stacks(stats):
+            f.write(f"{stack} {us}\n")
+
+    total = getattr(stats, "total_tt", 0.0)
+    print(f"[PROF] {stem} {phase}: {total:.3f}s, see {stats_path}")
+    return result
+
+
+def frame_name(func: Function) -> str:
+    file, line, name = func
+    if file == "~":
+        return name
+    return f"{name} ({os.path.basename(file)}:{line})"
+
+
+def collapsed_stacks(stats: "pstats.Stats") -> Iterator[Tuple[str, int]]:
+    """
+    Rebuilds call stacks from the caller/callee pairs cProfile keeps
+
+    cProfile does not record whole stacks, so a function called from several places
+    has its time split between them in proportion to the time of each call site.
+    Recursion is folded into the outermost call.
+    """
+    table = stats.stats  # type: ignore
+    children: dict[Function, list[Tuple[Function, float]]] = {}
+    roots = []
+    for func, (_, _, _, _, callers) in table.items():
+        if not callers:
+            roots.append(func)
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            children.setdefault(caller, []).append((func, edge_cumulative))
+
+    def walk(func: Function, share: float, path: list[Function]):
+        _, _, total_self, total_cumulative, _ = table[func]
+        path.append(func)
+        self_us = int(total_self * share * 1_000_000)
+        if self_us >= MIN_STACK_US:
+            yield ";".join(map(frame_name, path)), self_us
+        for child, edge_cumulative in children.get(func, []):
+            child_cumulative = table[child][3]
+            if child in path or not child_cumulative:
+                continue
+            child_share = share * edge_cumulative / child_cumulative
+            if edge_cumulative * share * 1_000_000 >= MIN_STACK_US:
+                yield from walk(child, child_share, path)
+        path.pop()
+
+    for root in roots:
+        yield from walk(root, 1.0, [])
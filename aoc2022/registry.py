@@ -0,0 +1,58 @@
+from aoc2022.advent import set_day_from_filename
+from aoc2022.util import Input, clean_lines
+from dataclasses import dataclass
+from io import TextIOWrapper
+from types import ModuleType
+from typing import Any, Callable
+
+import aoc2022
+import importlib
+import pkgutil
+import re
+
+DAY_MODULE = re.compile(r"^day(\d+)$")
+PARTS = ["p1", "p2"]
+
+
+@dataclass
+class Solver:
+    day: int
+    module: ModuleType
+    main: Callable[[], None]
+    parse: Callable[[TextIOWrapper], Any]
+    parts: dict[str, Callable[[Any], None]]
+
+    def activate(self) -> Input:
+        """
+        Makes this day the current one (for Output and the gif helpers)
+        """
+        set_day_from_filename(self.module.__file__ or f"day{self.day}.py")
+        return Input(self.day)
+
+
+def available_days() -> list[int]:
+    days = []
+    for info in pkgutil.iter_modules(aoc2022.__path__):
+        match = DAY_MODULE.match(info.name)
+        if match:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def load_solver(day: int) -> Solver:
+    """
+    Imports a day module and picks up its entry points
+
+    A day provides `main` and any of `solve_p1`/`solve_p2`.
+    The input is read with `clean_lines` unless the day defines its own `parse(f)`.
+
+    :param int day: the day number, e.g. 7 for aoc2022.day7
+    """
+    module = importlib.import_module(f"aoc2022.day{day}")
+    parts = {
+        part: getattr(module, f"solve_{part}")
+        for part in PARTS
+        if hasattr(module, f"solve_{part}")
+    }
+    parse = getattr(module, "parse", clean_lines)
+    return Solver(day, module, module.main, parse, parts)
@@ -0,0 +1,153 @@
+from aoc2022.registry import available_days, load_solver
+from aoc2022.util import time_limit
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+import traceback
+
+ANSWER = re.compile(r"^p\d\b")
+
+
+@dataclass
+class DayReport:
+    day: int
+    status: str
+    seconds: float
+    answers: list[str] = field(default_factory=list)
+    output: str = ""
+
+
+def extract_answers(output: str, fallback: bool = True) -> list[str]:
+    """
+    Picks the answer lines out of what a day printed
+
+    Every `input:` line starts a new section. Lines starting with `p1`/`p2` are answers;
+    with fallback, a section without any such line contributes its last line instead.
+    """
+    answers: list[str] = []
+    section = ""
+    found: list[str] = []
+    last = ""
+
+    def flush():
+        if found:
+            answers.extend(f"{section}: {line}" for line in found)
+        elif last and fallback:
+            answers.append(f"{section}: {last}")
+
+    for line in output.splitlines():
+        if line.startswith("input:"):
+            flush()
+            section = line.replace("input:", "").strip()
+            found, last = [], ""
+        elif ANSWER.match(line):
+            found.append(line)
+        elif line.strip():
+            last = line.strip()
+    flush()
+    return answers
+
+
+def run_day(day: int, timeout: Optional[float] = None) -> DayReport:
+    solver = load_solver(day)
+    buffer = io.StringIO()
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(buffer), time_limit(timeout):
+            solver.main()
+    except TimeoutError:
+        status = "timeout"
+    except Exception:
+        status = "error"
+        buffer.write(traceback.format_exc())
+    seconds = time.perf_counter() - start
+
+    output = buffer.getvalue()
+    answers = extract_answers(output, fallback=status == "ok")
+    return DayReport(day, status, seconds, answers, output)
+
+
+def run_all(
+    days: list[int], jobs: int, timeout: Optional[float] = None
+) -> list[DayReport]:
+    """
+    Runs the given days, in this process if jobs is 1, otherwise in a process pool
+    """
+    reports: list[DayReport] = []
+    if jobs <= 1:
+        for day in days:
+            report = run_day(day, timeout)
+            print_progress(report)
+            reports.append(report)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(days))) as pool:
+            futures = [pool.submit(run_day, day, timeout) for day in days]
+            for future in as_completed(futures):
+                report = future.result()
+                print_progress(report)
+                reports.append(report)
+
+    reports.sort(key=lambda r: r.day)
+    return reports
+
+
+def print_progress(report: DayReport):
+    print(f"[RUN] day {report.day} {report.status} in {report.seconds:.3f}s")
+
+
+def print_report(reports: list[DayReport], wall: float):
+    print()
+    for report in reports:
+        print(f"day {report.day:>2}  {report.status:<7} {report.seconds:8.3f}s")
+        for answer in report.answers:
+            print(f"    {answer}")
+        if report.status == "error":
+            print(report.output)
+
+    total = sum(report.seconds for report in reports)
+    slowest = max([report.seconds for report in reports], default=0)
+    print()
+    print(
+        f"[RUN] wall time {wall:.3f}s, sum of days {total:.3f}s, slowest day {slowest:.3f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2022", description="Runs all (or the selected) days"
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to run, default all")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes, 1 runs everything in this process",
+    )
+    parser.add_argument("--timeout", type=float, help="seconds allowed per day")
+    parser.add_argument("--json", help="also write the report to this file")
+    # unknown flags (e.g. --paint) are left in sys.argv for the days to see
+    args, _ = parser.parse_known_args()
+
+    days = args.days or available_days()
+    start = time.perf_counter()
+    reports = run_all(days, args.jobs, args.timeout)
+    wall = time.perf_counter() - start
+    print_report(reports, wall)
+
+    if args.json:
+        with open(args.json, mode="w") as f:
+            json.dump([asdict(report) for report in reports], f, indent=2)
+
+    if any(report.status != "ok" for report in reports):
+        sys.exit(1)
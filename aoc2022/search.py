@@ -0,0 +1,206 @@
+from aoc2022.grid import neighbor_table
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Tuple, TypeVar
+
+import heapq
+
+T = TypeVar("T")
+
+UNREACHABLE = -1
+
+Passable = Callable[[T, T], bool]  # (cell, neighbor) -> can step from cell to neighbor
+Cost = Callable[[T, T], Optional[float]]  # cost of the step, None if impassable
+
+
+@dataclass
+class SearchResult:
+    """
+    Distance and parent of every cell by flat index (y * width + x),
+    UNREACHABLE where the search did not get to
+    """
+
+    distance: list[Any]
+    parent: list[int]
+
+    def reached(self, index: int) -> bool:
+        return self.distance[index] != UNREACHABLE
+
+    def path(self, target: int) -> list[int]:
+        """
+        Flat indices from the source the target was reached from to the target,
+        empty if it was not reached
+        """
+        if not self.reached(target):
+            return []
+        path = [target]
+        while self.parent[path[-1]] != UNREACHABLE:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+        return path
+
+
+def multi_source_bfs(
+    grid: Any,
+    sources: Iterable[int],
+    passable: Passable,
+    target: Optional[int] = None,
+    diagonal: bool = False,
+) -> SearchResult:
+    """
+    Fewest steps from the nearest of the sources to every cell
+
+    Works on anything with width, height and all_cells, like Grid or Viewport.
+    Neighbors come from the shared neighbor table, passable is only asked about
+    the steps the search actually considers, no edge list is built.
+
+    :param Iterable sources: flat indices, all at distance 0
+    :param Callable passable: passable(cell, neighbor) allows the step
+    :param int target: stop once this flat index is reached
+    :param bool diagonal: 8 neighbors instead of the 4 sharing an edge
+    """
+    table = neighbor_table(grid.width, grid.height, diagonal)
+    offsets, targets = table.offsets, table.targets
+    cells = grid.all_cells()
+    distance = [UNREACHABLE] * len(cells)
+    parent = [UNREACHABLE] * len(cells)
+
+    frontier = []
+    for source in sources:
+        distance[source] = 0
+        frontier.append(source)
+
+    steps = 0
+    while frontier and (target is None or distance[target] == UNREACHABLE):
+        steps += 1
+        next_frontier = []
+        for index in frontier:
+            value = cells[index]
+            for neighbor in targets[offsets[index] : offsets[index + 1]]:
+                if distance[neighbor] == UNREACHABLE and passable(
+                    value, cells[neighbor]
+                ):
+                    distance[neighbor] = steps
+                    parent[neighbor] = index
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    return SearchResult(distance, parent)
+
+
+def bfs(
+    grid: Any,
+    source: int,
+    passable: Passable,
+    target: Optional[int] = None,
+    diagonal: bool = False,
+) -> SearchResult:
+    """
+    Fewest steps from the source to every cell, see multi_source_bfs
+    """
+    return multi_source_bfs(grid, [source], passable, target, diagonal)
+
+
+def best_first(
+    grid: Any,
+    sources: Iterable[int],
+    cost: Cost,
+    target: Optional[int],
+    diagonal: bool,
+    heuristic: Callable[[int], float],
+) -> SearchResult:
+    """
+    Dijkstra's algorithm, which becomes A* with a heuristic other than 0
+
+    The heap can hold stale entries for a cell whose distance improved later,
+    they are skipped when popped instead of being searched for and removed.
+    """
+    table = neighbor_table(grid.width, grid.height, diagonal)
+    offsets, targets = table.offsets, table.targets
+    cells = grid.all_cells()
+    distance: list[Any] = [UNREACHABLE] * len(cells)
+    parent = [UNREACHABLE] * len(cells)
+    done = [False] * len(cells)
+
+    heap: list[Tuple[float, float, int]] = []
+    for source in sources:
+        distance[source] = 0
+        heap.append((heuristic(source), 0, source))
+    heapq.heapify(heap)
+
+    while heap:
+        _, dist, index = heapq.heappop(heap)
+        if done[index]:
+            continue
+        done[index] = True
+        if index == target:
+            break
+
+        value = cells[index]
+        for neighbor in targets[offsets[index] : offsets[index + 1]]:
+            if done[neighbor]:
+                continue
+            step = cost(value, cells[neighbor])
+            if step is None:
+                continue
+            new_dist = dist + step
+            old_dist = distance[neighbor]
+            if old_dist == UNREACHABLE or new_dist < old_dist:
+                distance[neighbor] = new_dist
+                parent[neighbor] = index
+                priority = new_dist + heuristic(neighbor)
+                heapq.heappush(heap, (priority, new_dist, neighbor))
+
+    return SearchResult(distance, parent)
+
+
+def dijkstra(
+    grid: Any,
+    source: int,
+    cost: Cost,
+    target: Optional[int] = None,
+    diagonal: bool = False,
+) -> SearchResult:
+    """
+    Cheapest distance from the source to every cell
+
+    :param Callable cost: cost(cell, neighbor) of the step, at least 0,
+        None when the step is not allowed
+    :param int target: stop once the cheapest way to this flat index is known
+    """
+    return best_first(grid, [source], cost, target, diagonal, lambda _: 0)
+
+
+def astar(
+    grid: Any,
+    source: int,
+    target: int,
+    cost: Cost,
+    heuristic: Optional[Callable[[int], float]] = None,
+    diagonal: bool = False,
+) -> SearchResult:
+    """
+    Cheapest distance from the source to the target, guided by a heuristic
+
+    Only the distances on the way to the target are final.
+
+    :param Callable heuristic: estimate of the cost from a flat index to the
+        target, never more than the real cost, by default the number of steps
+        it would take on an open grid (so every step has to cost at least 1)
+    """
+    if heuristic is None:
+        heuristic = steps_to(grid.width, target, diagonal)
+    return best_first(grid, [source], cost, target, diagonal, heuristic)
+
+
+def steps_to(width: int, target: int, diagonal: bool) -> Callable[[int], int]:
+    """
+    Steps from a flat index to the target on an open grid, for astar
+    """
+    ty, tx = divmod(target, width)
+
+    def steps(index: int) -> int:
+        y, x = divmod(index, width)
+        dx, dy = abs(x - tx), abs(y - ty)
+        return max(dx, dy) if diagonal else dx + dy
+
+    return steps
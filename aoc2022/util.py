@@ -1,25 +1,38 @@
 from aoc2022.advent import current_day, day_from_filename
+from contextlib import contextmanager
 from io import TextIOWrapper
-from typing import Optional, TypeVar
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TypeVar
+
+import mmap
+import os
+import signal
 
 
 def clean_lines(f: TextIOWrapper) -> list[str]:
     return list(map(str.rstrip, f.readlines()))
 
 
-def split_by_newline(lines: list[str]) -> list[list[str]]:
-    result: list[list[str]] = []
+def split_by_newline(lines: Iterable[str]) -> list[list[str]]:
+    return list(iter_by_newline(lines))
+
+
+def iter_by_newline(lines: Iterable[str]) -> Iterator[list[str]]:
+    """
+    Lazily yields the blank-line separated groups, like split_by_newline
+
+    Works on any iterable of lines, e.g. a file, and only holds the current group.
+    """
     current: list[str] = []
     for line in lines:
         line = line.rstrip()
         if not line:
-            result.append(current)
+            yield current
             current = []
         else:
             current.append(line)
-    if current != []:
-        result.append(current)
-    return result
+    if current:
+        yield current
 
 
 T = TypeVar("T")
@@ -32,6 +45,75 @@ def split_to_chunks(lines: list[T], n) -> list[list[T]]:
     return result
 
 
+class ChunkView(Sequence[T]):
+    """
+    Items start to stop of a sequence, read from it instead of being copied out
+    """
+
+    __slots__ = ("items", "start", "stop")
+
+    def __init__(self, items: Sequence[T], start: int, stop: int):
+        self.items = items
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: Any) -> Any:
+        # a range does the bounds checks and negative indices
+        positions = range(self.start, self.stop)[index]
+        if isinstance(positions, range):
+            return [self.items[i] for i in positions]
+        return self.items[positions]
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self.items.__getitem__, range(self.start, self.stop))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def iter_chunks(items: Iterable[T], n: int) -> Iterator[Sequence[T]]:
+    """
+    Lazily yields n items at a time, like split_to_chunks, the last chunk can be shorter
+
+    Chunks of a sequence are views into it, an iterator is consumed n items
+    at a time into lists.
+    """
+    if isinstance(items, Sequence):
+        for start in range(0, len(items), n):
+            yield ChunkView(items, start, min(start + n, len(items)))
+        return
+
+    iterator = iter(items)
+    while chunk := list(islice(iterator, n)):
+        yield chunk
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Raises TimeoutError in the current (main) thread once the time runs out
+
+    :param float seconds: None or 0 disables the limit
+    """
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def expire(_signum, _frame):
+        raise TimeoutError(f"timed out after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
 class Raw:
     def __init__(self, val: str):
         self.val = val
@@ -55,6 +137,82 @@ class Input:
         self.test_path = f"input/day{day_num}-test.txt"
         self.challenge_path = f"input/day{day_num}.txt"
 
+    @staticmethod
+    @contextmanager
+    def open_mmap(path: str) -> Iterator[mmap.mmap | bytes]:
+        """
+        Maps a whole input file into memory, read-only
+
+        The pages are loaded by the OS as they are touched, so this costs nothing up front.
+        """
+        if os.path.getsize(path) == 0:
+            yield b""  # empty files cannot be mapped
+            return
+        with open(path, mode="rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+    @classmethod
+    def iter_lines(cls, path: str) -> Iterator[str]:
+        """
+        Lazily yields the lines of a file, right-stripped like clean_lines
+        """
+        with cls.open_mmap(path) as data:
+            if not data:
+                return
+            for line in iter(data.readline, b""):  # type: ignore
+                yield line.decode().rstrip()
+
+    @classmethod
+    def iter_groups(cls, path: str) -> Iterator[list[str]]:
+        """
+        Lazily yields the blank-line separated groups of a file, like split_by_newline
+        """
+        return iter_by_newline(cls.iter_lines(path))
+
+    def solve(
+        self,
+        path: str,
+        parse: Callable[[TextIOWrapper], Any],
+        *parts: Callable[[Any], None],
+    ):
+        """
+        Runs the parts of the day on one input file
+
+        The input is only parsed when a part is not answered by the result cache.
+        With --profile, the parse phase and every part are profiled separately.
+        With --instrument, the counter and timer totals are exported per input file.
+
+        :param str path: the input file
+        :param Callable parse: reads the opened file for the parts, e.g. clean_lines
+        """
+        from aoc2022.cache import cached_part
+        from aoc2022.instrument import export, is_instrumenting
+        from aoc2022.profiling import profiled
+
+        parsed: list[Any] = []
+
+        def parsed_input() -> Any:
+            if not parsed:
+                with open(path, mode="r") as f:
+                    parsed.append(profiled(path, "parse", parse, f))
+            return parsed[0]
+
+        def run(part: Callable[[Any], None]):
+            data = parsed_input()
+            profiled(path, part.__name__.replace("solve_", ""), part, data)
+
+        for part in parts:
+            cached_part(self.day, path, part, lambda: run(part))
+
+        if is_instrumenting():
+            stem = os.path.basename(path).replace(".txt", "")
+            export(
+                Output.create(
+                    name=f"{stem}_instrument", extension="json"
+                ).request_path()
+            )
+
     @classmethod
     def for_advent(cls) -> "Input":
         return cls(current_day())